@@ -0,0 +1,118 @@
+"""
+Benchmarks of flask-restful-swagger-3.
+
+Run them from the root of the repository, the fixtures of the tests are reused:
+
+    python -m benchmarks --out results.json
+"""
+import itertools
+import statistics
+import timeit
+
+from flask_restful_swagger_3 import Schema, Resource, swagger
+from tests.fixtures import fixture_resources as fixtures
+
+_uid = itertools.count()
+
+
+def measure(func, number=None, repeat=5, setup=None):
+    """
+    Times a function.
+    :param func: The function to time, called without argument
+    :param number: Number of calls per measure, found with timeit autorange when None
+    :param repeat: Number of measures
+    :param setup: Optional function called before each measure, not timed. Its result is passed to func
+    :return: The best and median time per call in seconds
+    """
+    if setup is None:
+        timer = timeit.Timer(func)
+        if number is None:
+            number, _ = timer.autorange()
+        times = [t / number for t in timer.repeat(repeat, number)]
+    else:
+        number = number or 1
+        times = []
+        for _ in range(repeat):
+            args = [setup() for _ in range(number)]
+            start = timeit.default_timer()
+            for arg in args:
+                func(arg)
+            times.append((timeit.default_timer() - start) / number)
+
+    return {
+        'number': number,
+        'repeat': repeat,
+        'best': min(times),
+        'median': statistics.median(times)
+    }
+
+
+def fixture_resources():
+    """
+    Builds the resources of the tests fixtures.
+    :return: A list of resource classes and their url rules
+    """
+    return [
+        (fixtures.parse_resource(), '/parse'),
+        (fixtures.user_resource(), '/users/<int:user_id>'),
+        (fixtures.p_resource(), '/api/users'),
+        (fixtures.one_resource(), '/some_data')
+    ]
+
+
+def synthetic_schema():
+    """
+    Builds a new schema, with a nested schema and an array property.
+    :return: The schema class
+    """
+    uid = next(_uid)
+    tag = type('BenchTag{}'.format(uid), (Schema,), {
+        'type': 'object',
+        'properties': {
+            'name': {'type': 'string'},
+            'weight': {'type': 'number', 'format': 'float'}
+        },
+        'required': ['name']
+    })
+    return type('BenchModel{}'.format(uid), (Schema,), {
+        'type': 'object',
+        'properties': {
+            'id': {'type': 'integer', 'format': 'int64'},
+            'name': {'type': 'string'},
+            'mail': {'type': 'string', 'format': 'email'},
+            'active': {'type': 'boolean'},
+            'secret': {'type': 'string', 'load_only': 'true'},
+            'tag': tag,
+            'keys': tag.array()
+        },
+        'required': ['id', 'name']
+    })
+
+
+def synthetic_resource():
+    """
+    Builds a new resource documented like the resources of a real application.
+    :return: The resource class and its url rule
+    """
+    model = synthetic_schema()
+
+    class BenchResource(Resource):
+        @swagger.tags('Bench')
+        @swagger.reorder_with(model, description="Returns an item")
+        @swagger.response(404, description="Not found")
+        @swagger.parameters([
+            {'in': 'query', 'name': 'name', 'description': 'Name', 'schema': {'type': 'string'}},
+            {'in': 'query', 'name': 'limit', 'schema': {'type': 'integer'}}
+        ])
+        def get(self, item_id, _parser):
+            return model(id=item_id, name='item'), 200
+
+        @swagger.tags('Bench')
+        @swagger.response(201, description="Created")
+        @swagger.expected(model, required=True)
+        def post(self, item_id):
+            return {}, 201
+
+    # flask-restful names the endpoints after the resource classes
+    BenchResource.__name__ = 'BenchResource{}'.format(model.__name__[len('BenchModel'):])
+    return BenchResource, '/bench{}/<int:item_id>'.format(model.__name__[len('BenchModel'):])
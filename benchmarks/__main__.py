@@ -0,0 +1,66 @@
+import argparse
+import json
+import platform
+import sys
+import time
+
+from benchmarks import registration, serving, schema
+
+try:
+    from importlib import metadata
+except ImportError:
+    # python < 3.8
+    metadata = None
+
+
+def get_version(name):
+    if metadata is None:
+        import pkg_resources
+
+        try:
+            return pkg_resources.get_distribution(name).version
+        except pkg_resources.DistributionNotFound:
+            return None
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='Benchmarks flask-restful-swagger-3 and writes the results as json.')
+    parser.add_argument('--out', help='The json file to write, the results are printed when not given')
+    parser.add_argument('--sizes', default='10,100,500',
+                        help='Comma separated numbers of synthetic resources (default: 10,100,500)')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of measures of each benchmark (default: 5)')
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    results = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'environment': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'packages': {name: get_version(name)
+                         for name in ('flask-restful-swagger-3', 'Flask', 'Flask-RESTful', 'Werkzeug')}
+        },
+        'unit': 'seconds',
+        'benchmarks': {
+            'add_resource': registration.run(sizes, args.repeat),
+            'swagger_endpoint_get': serving.run(sizes, args.repeat),
+            'schema': schema.run(args.repeat)
+        }
+    }
+
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(output + '\n')
+    else:
+        sys.stdout.write(output + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""
+Cost of Api.add_resource as the number of resources grows.
+"""
+from flask import Flask
+
+from flask_restful_swagger_3 import Api
+from benchmarks import measure, fixture_resources, synthetic_resource
+
+
+def register(args):
+    api, resources = args
+    for resource, url in resources:
+        api.add_resource(resource, url)
+
+
+def run(sizes, repeat):
+    """
+    :param sizes: The numbers of synthetic resources to register
+    :param repeat: Number of measures
+    :return: The time to register the fixture resources, and the synthetic resources for each size
+    """
+    results = {
+        'fixtures': measure(register, number=5, repeat=repeat,
+                            setup=lambda: (Api(Flask(__name__)), fixture_resources()))
+    }
+
+    for size in sizes:
+        result = measure(register, number=1, repeat=repeat,
+                         setup=lambda: (Api(Flask(__name__)), [synthetic_resource() for _ in range(size)]))
+        result['per_resource'] = {
+            'best': result['best'] / size,
+            'median': result['median'] / size
+        }
+        results['synthetic_{}'.format(size)] = result
+
+    return results
@@ -0,0 +1,42 @@
+"""
+Per-call cost of Schema(**kwargs), of Schema.validate_many(rows) and of swagger.get_parser(params).
+"""
+from flask_restful_swagger_3.swagger import get_parser
+from benchmarks import measure, synthetic_schema
+from tests.fixtures.fixture_models import PModel, UserModel, ModelToParse
+
+QUERY_PARAMS = [
+    {'in': 'query', 'name': 'str', 'schema': {'type': 'string'}},
+    {'in': 'query', 'name': 'date', 'schema': {'type': 'string', 'format': 'date'}},
+    {'in': 'query', 'name': 'datetime', 'schema': {'type': 'string', 'format': 'date-time'}},
+    {'in': 'query', 'name': 'bool', 'schema': {'type': 'boolean'}},
+    {'in': 'query', 'name': 'int', 'schema': {'type': 'integer'}},
+    {'in': 'query', 'name': 'float', 'schema': {'type': 'number', 'format': 'float'}},
+    {'in': 'query', 'name': 'parsing', 'schema': ModelToParse}
+]
+
+
+def run(repeat):
+    """
+    :param repeat: Number of measures
+    :return: The time per call of the instantiation of schemas, of the validation of 1000 rows and of the creation
+    of query parsers
+    """
+    model = synthetic_schema()
+    tag = {'name': 'tag', 'weight': 1.5}
+    rows = [dict(id=i, name='somebody', mail='somebody{}@example.com'.format(i), active=True, secret='secret', tag=tag,
+                 keys=[tag, tag, tag]) for i in range(1000)]
+
+    return {
+        'schema_user': measure(lambda: UserModel(id=1, name='somebody', password='secret'), repeat=repeat),
+        'schema_p': measure(lambda: PModel(id=1, name='somebody', mail='somebody@example.com', keys=['a', 'b']),
+                            repeat=repeat),
+        'schema_nested': measure(lambda: model(id=1, name='somebody', mail='somebody@example.com', active=True,
+                                               secret='secret', tag=tag, keys=[tag, tag, tag]),
+                                 repeat=repeat),
+        'schema_nested_1000_rows': measure(lambda: [model(**row) for row in rows], repeat=repeat),
+        'validate_many_nested_1000_rows': measure(lambda: model.validate_many(rows), repeat=repeat),
+        'get_parser_fixture': measure(lambda: get_parser(QUERY_PARAMS), repeat=repeat),
+        'get_parser_object': measure(lambda: get_parser([{'in': 'query', 'name': 'body', 'schema': PModel}]),
+                                     repeat=repeat)
+    }
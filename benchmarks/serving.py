@@ -0,0 +1,53 @@
+"""
+Latency of the specification endpoint (SwaggerEndpoint.get).
+"""
+from flask import Flask
+
+from flask_restful_swagger_3 import Api, swagger
+from benchmarks import measure, fixture_resources, synthetic_resource
+
+SPEC_URL = '/api/doc/swagger.json'
+
+
+def build_api(size):
+    app = Flask(__name__)
+    api = Api(app)
+    for resource, url in fixture_resources() + [synthetic_resource() for _ in range(size)]:
+        api.add_resource(resource, url)
+    return api, app.test_client()
+
+
+def run(sizes, repeat):
+    """
+    :param sizes: The numbers of synthetic resources registered next to the fixture resources
+    :param repeat: Number of measures
+    :return: For each size, the latency of a request right after add_resource, of the following requests,
+    of the conditional requests and of the requests filtered by an overridden `auth`
+    """
+    results = {}
+
+    for size in sizes:
+        api, client = build_api(size)
+
+        def add_one_resource():
+            api.add_resource(*synthetic_resource())
+
+        result = {
+            'after_add_resource': measure(lambda _: client.get(SPEC_URL), number=1, repeat=repeat,
+                                          setup=add_one_resource),
+            'compiled': measure(lambda: client.get(SPEC_URL), repeat=repeat)
+        }
+
+        etag = client.get(SPEC_URL).headers['ETag']
+        result['not_modified'] = measure(lambda: client.get(SPEC_URL, headers={'If-None-Match': etag}),
+                                         repeat=repeat)
+
+        swagger.auth = lambda api_key, endpoint, method: method == 'get'
+        try:
+            result['auth_filtered'] = measure(lambda: client.get(SPEC_URL + '?api_key=key'), repeat=repeat)
+        finally:
+            swagger.auth = swagger._default_auth
+
+        results['resources_{}'.format(size)] = result
+
+    return results
@@ -1,7 +1,13 @@
 import os
 import json
 import inspect
+import hashlib
+import logging
+from collections import deque
+from collections.abc import Mapping
 from copy import deepcopy
+from functools import partial
+from threading import Lock
 
 from flask import Blueprint, request, render_template, send_from_directory, current_app
 from flask_restful import (Api as restful_Api, abort as flask_abort,
@@ -11,12 +17,41 @@ from flask_restful_swagger_3.exceptions import SchemaAlreadyExist
 from flask_restful_swagger_3.swagger import (ValidationError, create_open_api_resource,
                                              add_parameters, validate_path_item_object,
                                              validate_components_object, validate_open_api_object,
-                                             extract_swagger_path, _auth as auth,
+                                             validate_paths_object, validate_map_schema_object,
+                                             extract_swagger_path, extract_rule_swagger_path,
+                                             is_auth_overridden, _auth as auth,
                                              slash_join, REGISTRY_SCHEMA)
 
 from flask_restful_swagger_3.constants import TypeSwagger
 
-from flask_restful_swagger_3.swagger_format import get_validate_format
+_logger = logging.getLogger(__name__)
+
+# flask_restful_swagger_3.profiling, and tracemalloc with it, is only imported when the profiling is enabled
+PROFILE_REGISTRATION_ENV = 'FLASK_RESTFUL_SWAGGER_3_PROFILE_REGISTRATION'
+
+
+def _is_profiling_enabled(profile_registration=False):
+    """
+    :param profile_registration: The profile_registration parameter of the Api
+    :return: True when the parameter or the environment variable FLASK_RESTFUL_SWAGGER_3_PROFILE_REGISTRATION
+    ("1", "true" or "yes") enables the profiling
+    """
+    return profile_registration or os.environ.get(PROFILE_REGISTRATION_ENV, '').lower() in ('1', 'true', 'yes')
+
+
+class _NoProfiling:
+    """
+    Context manager doing nothing, used in place of the phases when the profiling isn't enabled
+    """
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return None
+
+
+_NO_PROFILING = _NoProfiling()
 
 
 def abort(http_status_code, schema=None, **kwargs):
@@ -33,8 +68,10 @@ def auth_required(f):
     """Decorator which checks if the request is permitted to call the view"""
 
     def decorator(*args, **kwargs):
-        if not auth(request.args.get('api_key'), extract_swagger_path(request.url_rule.rule), request.method):
-            abort(401)
+        # the default auth grants every request, don't pay for its arguments
+        if is_auth_overridden():
+            if not auth(request.args.get('api_key'), extract_rule_swagger_path(request.url_rule.rule), request.method):
+                abort(401)
         return f(*args, **kwargs)
 
     return decorator
@@ -63,16 +100,59 @@ class Api(restful_Api):
             "tags": [],
             "externalDocs": {},
         }
+        self.__spec_generation = 0
+        self.__validated = False
+        self.__pending_resources = deque()
+        self.__pending_lock = Lock()
+        # set under the lock once every pending resource has been built, the error of a failed build is kept
+        self.__pending_built = True
+        self.__pending_error = None
+        # the resources as registered, their fingerprints are computed from them on demand, see fingerprints
+        self.__resources = []
+        # the fingerprints of the snapshot resources which haven't been registered yet, None without snapshot
+        self.__snapshot = None
+        # the operations of the registered resources, which are kept when snapshot operations are dropped
+        self.__snapshot_operations = set()
 
         swagger_prefix_url = kwargs.pop("swagger_prefix_url", "/api/doc")
         swagger_url = kwargs.pop("swagger_url", "swagger.json")
         add_api_spec_resource = kwargs.pop("add_api_spec_resource", True)
         authorizations = kwargs.pop("authorizations", None)
+        self.__lazy_spec = kwargs.pop("lazy_spec", False)
+        spec_cache_control = kwargs.pop("spec_cache_control", None)
+        auth_cache_size = kwargs.pop("auth_cache_size", None)
+        auth_cache_ttl = kwargs.pop("auth_cache_ttl", 60)
+        stream_spec = kwargs.pop("stream_spec", False)
+        spec_snapshot = kwargs.pop("spec_snapshot", None)
+        profile_registration = kwargs.pop("profile_registration", False)
+        self.__profiler = None
+        if _is_profiling_enabled(profile_registration):
+            from flask_restful_swagger_3.profiling import RegistrationProfiler
+            self.__profiler = RegistrationProfiler()
 
         if authorizations:
-            self.open_api_object["components"]["securitySchemes"] = authorizations
+            self.__open_api_object["components"]["securitySchemes"] = authorizations
 
         add_parameters(self.__open_api_object, kwargs)
+        try:
+            self.__api_fingerprint = _digest(self.__open_api_object)
+        except _Unfingerprintable:
+            self.__api_fingerprint = None
+
+        if spec_snapshot:
+            with open(spec_snapshot) as f:
+                snapshot = json.load(f)
+            fingerprints = snapshot.pop("x-fingerprints", {})
+            if self.__api_fingerprint is not None and fingerprints.get("api") == self.__api_fingerprint:
+                self.__snapshot = dict(fingerprints.get("resources", {}))
+                snapshot.setdefault("components", {})
+                snapshot.setdefault("paths", {})
+                self.__open_api_object = snapshot
+                # the snapshot has been validated when it was exported
+                self.__validated = True
+            else:
+                _logger.warning('The arguments of the Api do not match the snapshot "%s", the documentation is rebuilt',
+                                spec_snapshot)
 
         super().__init__(*args, **kwargs)
 
@@ -80,15 +160,99 @@ class Api(restful_Api):
             url_prefix=swagger_prefix_url,
             url=swagger_url,
         )
+        # a fragment of the document, e.g. /api/doc/swagger.json/components/schemas/UserModel
+        open_api_pointer_url = self.__swagger_url(
+            url_prefix=swagger_prefix_url,
+            url=f"{swagger_url}/<path:pointer>",
+        )
+        # the shard of a tag, e.g. /api/doc/swagger/User.json
+        stem, extension = os.path.splitext(swagger_url)
+        open_api_shard_urls = []
+        if extension:
+            # without extension, the shard urls would be the urls of the fragments, the shards are requested with ?tags=
+            open_api_shard_urls.append(self.__swagger_url(
+                url_prefix=swagger_prefix_url,
+                url=f"{stem}/<string:tag>{extension}",
+            ))
 
         if add_api_spec_resource:
             self.add_resource(
-                create_open_api_resource(self.__open_api_object),
+                create_open_api_resource(self.__open_api_object, generation=lambda: self.spec_generation,
+                                         cache_control=spec_cache_control, auth_cache_size=auth_cache_size,
+                                         auth_cache_ttl=auth_cache_ttl, stream=stream_spec),
                 open_api_url,
+                *open_api_shard_urls,
+                open_api_pointer_url,
                 endpoint="open_api",
             )
 
     def add_resource(self, resource, *args, endpoint=None, **kwargs):
+        name = endpoint or resource.__name__.lower()
+        url_prefix = self.blueprint.url_prefix if self.blueprint else None
+        self.__resources.append((name, resource, args, url_prefix))
+
+        if self.__snapshot is not None and self.__match_snapshot(name, resource, args, url_prefix):
+            # the snapshot already documents the resource
+            pass
+        else:
+            if self.__lazy_spec:
+                # the documentation of the resource is built on the first access to the open api object
+                with self.__pending_lock:
+                    self.__pending_resources.append((resource, args))
+                    self.__pending_built = False
+            else:
+                self.__add_resource_spec(resource, *args)
+
+        super().add_resource(resource, *args, endpoint=endpoint, **kwargs)
+
+    def __match_snapshot(self, name, resource, urls, url_prefix):
+        """
+        Compares a resource to its fingerprint in the snapshot, the snapshot operations of a resource which doesn't
+        match are dropped before it is rebuilt
+        :return: True when the snapshot documents the resource
+        """
+        operations = _operation_keys(resource, urls, url_prefix)
+        self.__snapshot_operations.update((path, method) for path, method in operations)
+        snapshot = self.__snapshot.pop(name, None)
+        fingerprint = _fingerprint(resource, urls, url_prefix)
+        if fingerprint is None:
+            _logger.warning('The documentation of "%s" holds values which can\'t be fingerprinted, it is rebuilt', name)
+        elif snapshot and snapshot["fingerprint"] == fingerprint:
+            return True
+        else:
+            _logger.warning('The documentation of "%s" does not match the snapshot, it is rebuilt', name)
+        if snapshot:
+            self.__drop_snapshot_operations(snapshot["operations"])
+        return False
+
+    def __drop_snapshot_operations(self, operations):
+        paths = self.__open_api_object["paths"]
+        for path, method in operations:
+            # an operation which is also documented by a registered resource isn't stale
+            if (path, method) not in self.__snapshot_operations and method in paths.get(path, {}):
+                del paths[path][method]
+                if not paths[path]:
+                    del paths[path]
+
+    def __drop_unregistered_resources(self):
+        # the snapshot resources which haven't been registered before the first access to the document are gone
+        if self.__snapshot:
+            for snapshot in self.__snapshot.values():
+                self.__drop_snapshot_operations(snapshot["operations"])
+            self.__snapshot.clear()
+            self.__spec_generation += 1
+
+    def __add_resource_spec(self, resource, *args):
+        if self.__profiler:
+            with self.__profiler.resource(resource, args):
+                self.__build_resource_spec(resource, *args)
+        else:
+            self.__build_resource_spec(resource, *args)
+
+    def __phase(self, name):
+        return self.__profiler.phase(name) if self.__profiler else _NO_PROFILING
+
+    def __build_resource_spec(self, resource, *args):
         schemas = {}
         urls = {}
 
@@ -114,18 +278,22 @@ class Api(restful_Api):
                 )
 
                 if reqparser:
-                    parser_json_result, _params = RequestParserExtractor(reqparser).extract()
+                    with self.__phase("RequestParserExtractor.extract"):
+                        parser_json_result, _params = RequestParserExtractor(reqparser).extract()
                     if parser_json_result and request_body:
                         raise ValidationError("requestBody and reqparser can't be in same spec")
                     request_body = parser_json_result
-                    params += _params
+                    # the parameters of the decorator are kept as they are, they are fingerprinted
+                    params = params + _params
 
-                result_model = [self.__build_model(model) for model in model_list]
+                with self.__phase("__build_model"):
+                    result_model = [self.__build_model(model) for model in model_list]
 
                 for param in params:
                     if "schema" in param:
                         if type(param["schema"]) is type and param["schema"].__name__ in REGISTRY_SCHEMA:
-                            result_model.append(self.__build_model(param["schema"]))
+                            with self.__phase("__build_model"):
+                                result_model.append(self.__build_model(param["schema"]))
 
                 for result in result_model:
                     if result:
@@ -134,12 +302,14 @@ class Api(restful_Api):
                 req_ref = None
                 req_example = None
                 if request_body:
-                    req_schema, req_body = self.__build_request_body(request_body)
+                    with self.__phase("__build_request_body"):
+                        req_schema, req_body = self.__build_request_body(request_body)
                     operations_object[method].update(req_body)
                     if req_schema:
                         schemas.update(req_schema)
 
-                    req_result_model = self.__build_model(request_body['schema'] if request_body else None)
+                    with self.__phase("__build_model"):
+                        req_result_model = self.__build_model(request_body['schema'] if request_body else None)
                     req_ref = (
                             req_result_model["reference"]
                             if req_result_model
@@ -188,7 +358,8 @@ class Api(restful_Api):
                                 raise ValidationError('url_prefix must not have ending slash')
                             url = self.blueprint.url_prefix + url
 
-                        converted_url, parameters = self.__build_parameters(url, params)
+                        with self.__phase("__build_parameters"):
+                            converted_url, parameters = self.__build_parameters(url, params)
 
                         operations_object[method]['tags'] = tags
                         operations_object[method].update(parameters)
@@ -205,12 +376,6 @@ class Api(restful_Api):
                             elif len(tags) > 0:
                                 operations_object[method]["summary"] = f"Operations on {', '.join(tags).lower()}"
 
-                        if "securitySchemes" in self.open_api_object["components"]:
-                            components_security_schemes = self.open_api_object["components"]["securitySchemes"]
-                        else:
-                            components_security_schemes = None
-                        validate_path_item_object(operations_object, components_security_schemes)
-
                         if converted_url in urls:
                             urls[converted_url].update(operations_object)
                         else:
@@ -226,10 +391,48 @@ class Api(restful_Api):
         if 'externalDocs' in self.__open_api_object and not self.__open_api_object['externalDocs']:
             del self.__open_api_object['externalDocs']
 
+        if self.__validated:
+            # only validate what has been added, see finalize for a full validation
+            if "securitySchemes" in self.__open_api_object["components"]:
+                components_security_schemes = self.__open_api_object["components"]["securitySchemes"]
+            else:
+                components_security_schemes = None
+            with self.__phase("validate_paths_object"):
+                validate_paths_object(urls, components_security_schemes)
+            with self.__phase("validate_map_schema_object"):
+                validate_map_schema_object(schemas)
+        else:
+            with self.__phase("validate_open_api_object"):
+                validate_open_api_object(self.__open_api_object)
+            self.__validated = True
+        self.__spec_generation += 1
+
+    def __build_pending_resources(self):
+        with self.__pending_lock:
+            self.__drop_unregistered_resources()
+            if self.__pending_built:
+                return
+            if self.__pending_error is not None:
+                # the document is invalid, it must not be served
+                raise self.__pending_error
+            while self.__pending_resources:
+                resource, urls = self.__pending_resources[0]
+                try:
+                    self.__add_resource_spec(resource, *urls)
+                except Exception as e:
+                    self.__pending_error = e
+                    raise
+                self.__pending_resources.popleft()
+            self.__pending_built = True
+
+    def finalize(self):
+        """
+        Validates the whole open api object.
+        add_resource only validates the paths and schemas it adds, call this once every resource is registered
+        to also check what has been changed directly in open_api_object.
+        """
         validate_open_api_object(self.open_api_object)
 
-        super().add_resource(resource, *args, endpoint=endpoint, **kwargs)
-
     @staticmethod
     def __swagger_url(url_prefix: str, url: str):
         new_url = slash_join(url_prefix, url)
@@ -247,15 +450,11 @@ class Api(restful_Api):
             except AttributeError:
                 raise TypeError("'schema' used with 'reorder_with' must be a sub class of Schema")
 
-            definition = schema[0].definitions() if is_list else schema.definitions()
             reference = schema[0].reference() if is_list else schema.reference()
-            _schema = json.loads(json.dumps(definition, cls=DefinitionEncoder))
+            # the cached json data is shared by every Api, the document gets its own copy which can be edited
+            _schema = _copy_json(_json_definitions(schema[0] if is_list else schema))
 
-            example = (
-                [json.loads(json.dumps(schema[0].example(), cls=ExampleEncoder))]
-                if is_list
-                else json.loads(json.dumps(schema.example(), cls=ExampleEncoder))
-            )
+            example = _copy_json([_json_example(schema[0])] if is_list else _json_example(schema))
 
             schema_example_name = schema[0].reference_example_name() if is_list else schema.reference_example_name()
             reference_example = schema[0].reference_example() if is_list else schema.reference_example()
@@ -326,7 +525,8 @@ class Api(restful_Api):
         if additional_parameters:
             for param in additional_parameters:
                 try:
-                    param["schema"] = param["schema"].reference()
+                    # the document gets a copy, the parameter of the decorator keeps its schema
+                    param = dict(param, schema=param["schema"].reference())
                 except AttributeError:
                     if not type(param["schema"]) == dict:
                         raise ValidationError(f"'schema' must be of type 'dict' or subclass of 'Schema', not {type(param['schema'])}")
@@ -354,7 +554,8 @@ class Api(restful_Api):
         }
 
         if schema:
-            model = self.__build_model(schema)
+            with self.__phase("__build_model"):
+                model = self.__build_model(schema)
             reference = {"schema": model["reference"]}
 
             result["requestBody"]["content"]["application/json"].update(reference)
@@ -365,8 +566,38 @@ class Api(restful_Api):
 
     @property
     def open_api_object(self):
+        self.__build_pending_resources()
         return self.__open_api_object
 
+    @property
+    def fingerprints(self):
+        """
+        Digests of what the documentation is built from, see export_swagger_doc: the digest of the arguments of the Api
+        in "api", and in "resources" the fingerprint and the [path, method] of the operations of each resource,
+        by endpoint
+        """
+        return {
+            "api": self.__api_fingerprint,
+            "resources": {
+                name: {
+                    "fingerprint": _fingerprint(resource, urls, url_prefix),
+                    "operations": _operation_keys(resource, urls, url_prefix),
+                }
+                for name, resource, urls, url_prefix in self.__resources
+            },
+        }
+
+    @property
+    def registration_profile(self):
+        """The RegistrationProfiler of the resources, None when the profiling isn't enabled"""
+        return self.__profiler
+
+    @property
+    def spec_generation(self):
+        """Counter incremented each time the open api object is updated by add_resource"""
+        self.__build_pending_resources()
+        return self.__spec_generation
+
 
 class RequestParserExtractor:
     """
@@ -500,16 +731,80 @@ class RequestParserExtractor:
         param['type'] = 'array'
 
 
+_TYPE_CHECKS = {
+    'integer': (int, 'an int'),
+    'number': ((int, float), 'an int or float'),
+    'string': (str, 'a string'),
+    'boolean': (bool, 'a bool'),
+}
+
+
+# registration order of the schemas, used to sort the super classes of a schema
+_REGISTRY_INDEX = {}
+
+
 def register_schema(target_class):
     if target_class.__name__ in REGISTRY_SCHEMA:
         raise SchemaAlreadyExist(target_class.__name__)
     REGISTRY_SCHEMA[target_class.__name__] = target_class
+    _REGISTRY_INDEX[target_class] = len(_REGISTRY_INDEX)
+
+
+class SchemaRecord(Mapping):
+    """
+    Base of the records of the schemas in record mode. The values are stored in slots, a record has no __dict__ and
+    no hash table, and is a read only mapping of the given attributes.
+    """
+    __slots__ = ()
+    # the schema of the records
+    _schema = None
+    # the slot descriptors of the attributes, by attribute
+    _fields = {}
+
+    def __getitem__(self, key):
+        try:
+            return self._fields[key].__get__(self)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        for key, field in self._fields.items():
+            try:
+                field.__get__(self)
+            except AttributeError:
+                continue
+            yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return '{0}({1!r})'.format(type(self).__name__, dict(self))
+
+
+def _make_record_class(schema):
+    """
+    Returns the record class of a schema, with a slot for each of its attributes which are not load_only
+    """
+    keys = [k for k in schema.properties if k not in schema._Schema__load_only]
+    # the attributes aren't always identifiers, the slots are numbered
+    record_class = type(schema.__name__ + 'Record', (SchemaRecord,), {
+        '__slots__': tuple('_{}'.format(i) for i in range(len(keys))),
+        '_schema': schema
+    })
+    record_class._fields = {k: getattr(record_class, '_{}'.format(i)) for i, k in enumerate(keys)}
+    return record_class
 
 
 class Schema(dict):
     properties = None
+    __validators = None
+    __column_checks = None
+    __load_only = frozenset()
+    __record = None
+    __custom_checks = False
 
-    def __init_subclass__(cls, **kwargs):
+    def __init_subclass__(cls, record=False, **kwargs):
         register_schema(cls)
         super().__init_subclass__(**kwargs)
         super_classes = cls.get_super_classes()
@@ -545,48 +840,61 @@ class Schema(dict):
         if cls.properties and not hasattr(cls, 'type'):
             cls.type = 'object'
 
+        cls.__compile_validators()
+
+        # the subclasses which override the checks are validated attribute by attribute with them
+        cls.__custom_checks = (cls.check_type is not Schema.check_type or cls.check_format is not Schema.check_format
+                               or cls.get_boolean_attribute is not Schema.get_boolean_attribute)
+
+        cls.__record = None
+        if record:
+            if cls.__validators is None:
+                raise TypeError("Only the schemas with properties can be in record mode")
+            if cls.__custom_checks:
+                raise TypeError("The schemas which override check_type, check_format or get_boolean_attribute "
+                                "can't be in record mode")
+            cls.__record = _make_record_class(cls)
+
+    def __new__(cls, *args, **kwargs):
+        if cls.__record is not None:
+            return cls.__new_record(kwargs)
+        return super().__new__(cls, *args, **kwargs)
+
+    @classmethod
+    def __new_record(cls, kwargs):
+        validators = cls.__validators
+        for k, v in kwargs.items():
+            if k not in validators:
+                raise ValueError('The model "{0}" does not have an attribute "{1}"'.format(cls.__name__, k))
+            validators[k](v)
+
+        for key in getattr(cls, 'required', ()):
+            if key not in kwargs:
+                raise ValueError('The attribute "{0}" is required'.format(key))
+
+        record = object.__new__(cls.__record)
+        fields = record._fields
+        for k, v in kwargs.items():
+            if k in fields:
+                fields[k].__set__(record, v)
+        return record
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-        if self.properties:
+        validators = self.__validators
+        if validators is not None and self.__custom_checks:
             for k, v in kwargs.items():
-                if k not in self.properties:
+                self.__check_attribute(k, v)
+        elif validators is not None:
+            load_only = self.__load_only
+            for k, v in kwargs.items():
+                if k not in validators:
                     raise ValueError(
                             'The model "{0}" does not have an attribute "{1}"'.format(self.__class__.__name__, k))
-                if type(self.properties[k]) == type:
-                    if self.properties[k].type == 'object':
-                        self.properties[k](**v)
-                    self.prop = self.properties[k].definitions()
-                else:
-                    self.prop = self.properties[k]
-
-                nullable = self.get_boolean_attribute('nullable')
-                load_only = self.get_boolean_attribute('load_only')
-                dump_only = self.get_boolean_attribute('dump_only')
-                if load_only and dump_only:
-                    raise TypeError('A value can\'t be load_only and dump_only in the same schema')
-
-                type_ = self.prop.get('type', None)
-                format_ = self.prop.get('format', None)
-
-                if not (nullable and v is None):
-                    self.check_type(type_, k, v)
-                    if 'enum' in self.prop:
-                        if type(self.prop['enum']) not in [set, list, tuple]:
-                            raise TypeError(f"'enum' must be 'list', 'set' or 'tuple',"
-                                            f"but was {type(self.prop['enum'])}")
-                        for item in list(self.prop['enum']):
-                            self.check_type(type_, 'enum', item)
-                        if v not in self.prop['enum']:
-                            raise ValueError(f"{k} must have {' or '.join(self.prop['enum'])} but have {v}")
-
-                    self.check_format(type_, format_, v)
-
-                if load_only:
+                validators[k](v)
+                if k in load_only:
                     del self[k]
-                    continue
-
-                self[k] = v
 
         if hasattr(self, 'required'):
             self.required = list(self.required)
@@ -594,12 +902,314 @@ class Schema(dict):
                 if key not in kwargs:
                     raise ValueError('The attribute "{0}" is required'.format(key))
 
+    def __check_attribute(self, key, value):
+        if key not in self.properties:
+            raise ValueError('The model "{0}" does not have an attribute "{1}"'.format(self.__class__.__name__, key))
+        if type(self.properties[key]) == type:
+            if self.properties[key].type == 'object':
+                self.properties[key](**value)
+            self.prop = self.properties[key].definitions()
+        else:
+            self.prop = self.properties[key]
+
+        nullable = self.get_boolean_attribute('nullable')
+        load_only = self.get_boolean_attribute('load_only')
+        dump_only = self.get_boolean_attribute('dump_only')
+        if load_only and dump_only:
+            raise TypeError('A value can\'t be load_only and dump_only in the same schema')
+
+        type_ = self.prop.get('type', None)
+        format_ = self.prop.get('format', None)
+
+        if not (nullable and value is None):
+            self.check_type(type_, key, value)
+            if 'enum' in self.prop:
+                for item in list(self.__get_enum(self.prop, None)):
+                    self.check_type(type_, 'enum', item)
+                if value not in self.prop['enum']:
+                    raise ValueError(f"{key} must have {' or '.join(self.prop['enum'])} but have {value}")
+
+            self.check_format(type_, format_, value)
+
+        if load_only:
+            self.pop(key, None)
+
+    @classmethod
+    def __check_with_custom_checks(cls, key, value):
+        dict.__new__(cls).__check_attribute(key, value)
+
     def get_boolean_attribute(self, attr):
+        return self.__get_boolean_attribute(self.prop, attr)
+
+    def check_type(self, type_, key, value):
+        items = None
+        if type_ == 'array':
+            prop = self.properties[key]
+            items = (prop.definitions() if type(prop) == type else prop).get('items', None)
+        type_check = self.__compile_type_check(type_, items)
+        if type_check:
+            type_check(key, value)
+
+    @staticmethod
+    def check_format(type_, format_, value):
+        from flask_restful_swagger_3.swagger_format import get_validate_format
+
+        validator = get_validate_format(type_, format_)
+        if validator:
+            validator().validate(value)
+
+    @classmethod
+    def __compile_validators(cls):
+        """
+        Resolves, once per class, the checks done on each attribute when the schema is instantiated
+        """
+        cls.__validators = None
+        cls.__column_checks = None
+        cls.__load_only = frozenset()
+        if cls.properties:
+            cls.__validators = {}
+            cls.__column_checks = {}
+            load_only = set()
+            for k, v in cls.properties.items():
+                try:
+                    cls.__validators[k], cls.__column_checks[k], is_load_only = cls.__compile_property(k, v)
+                except (AttributeError, TypeError, ValueError):
+                    # raise the error only when the attribute is given, as when it was checked at instantiation
+                    cls.__validators[k], is_load_only = partial(cls.__raise_property_error, k, v), False
+                    cls.__column_checks[k] = None
+                if is_load_only:
+                    load_only.add(k)
+            cls.__load_only = frozenset(load_only)
+
+    @classmethod
+    def validate_many(cls, rows):
+        """
+        Validates a list of rows as instantiating the schema with each of them would, column by column:
+        the values of each attribute are checked together, then one by one only to report the errors.
+        :param rows: The dicts to validate
+        :return: A tuple (records, errors). records is the list of the validated rows, as dicts without the
+        load_only attributes, or None when a row is invalid. errors is the list of the errors, as dicts with the
+        index of the "row", the "field" and the "message", sorted by row
+        """
+        rows = rows if type(rows) is list else list(rows)
+        keys = set().union(*rows)
+        errors = []
+
+        validators = cls.__validators
+        if validators is not None:
+            for k in sorted(keys.difference(validators), key=str):
+                message = 'The model "{0}" does not have an attribute "{1}"'.format(cls.__name__, k)
+                errors.extend({'row': i, 'field': k, 'message': message} for i, row in enumerate(rows) if k in row)
+
+            for k, check in validators.items():
+                if k not in keys:
+                    continue
+                values = [row[k] for row in rows if k in row]
+                column_check = cls.__column_checks[k]
+                if cls.__custom_checks:
+                    check, column_check = partial(cls.__check_with_custom_checks, k), None
+                if column_check is not None and column_check(values):
+                    continue
+                indexes = range(len(rows)) if len(values) == len(rows) else \
+                    [i for i, row in enumerate(rows) if k in row]
+                for i, value in zip(indexes, values):
+                    try:
+                        check(value)
+                    except (TypeError, ValueError) as e:
+                        errors.append({'row': i, 'field': k, 'message': str(e)})
+
+        for k in getattr(cls, 'required', ()):
+            message = 'The attribute "{0}" is required'.format(k)
+            errors.extend({'row': i, 'field': k, 'message': message} for i, row in enumerate(rows) if k not in row)
+
+        if errors:
+            errors.sort(key=lambda error: error['row'])
+            return None, errors
+
+        load_only = cls.__load_only
+        if load_only:
+            return [{k: v for k, v in row.items() if k not in load_only} for row in rows], errors
+        return [dict(row) for row in rows], errors
+
+    @classmethod
+    def __raise_property_error(cls, key, schema_or_prop, value):
+        cls.__compile_property(key, schema_or_prop)
+
+    @classmethod
+    def __compile_property(cls, key, schema_or_prop):
+        nested = None
+        if type(schema_or_prop) == type:
+            if schema_or_prop.type == 'object':
+                nested = schema_or_prop
+            prop = schema_or_prop.definitions()
+        else:
+            prop = schema_or_prop
+
+        try:
+            nullable, load_only = cls.__get_flags(prop)
+            flags_error = False
+        except (TypeError, ValueError):
+            nullable, load_only = False, False
+            flags_error = True
+
+        type_ = prop.get('type', None)
+        type_check = cls.__compile_type_check(type_, prop.get('items', None))
+
+        has_enum = 'enum' in prop
+        enum = None
+        if has_enum:
+            try:
+                enum = cls.__get_enum(prop, type_check)
+                if type_ in _TYPE_CHECKS:
+                    enum = frozenset(enum)
+            except (TypeError, ValueError):
+                enum = None
+
+        column_type_check = cls.__compile_column_type_check(type_, prop.get('items', None))
+        from flask_restful_swagger_3.swagger_format import get_validate_format
+
+        validator = get_validate_format(type_, prop.get('format', None))
+        validate = validator().validate if validator else None
+        bounded = validator is not None and hasattr(validator, 'min_value') and hasattr(validator, 'max_value')
+
+        def check(value):
+            if nested is not None:
+                nested(**value)
+            if flags_error:
+                cls.__get_flags(prop)
+            if nullable and value is None:
+                return
+            if type_check:
+                type_check(key, value)
+            if has_enum:
+                if enum is None:
+                    cls.__get_enum(prop, type_check)
+                if value not in enum:
+                    raise ValueError(f"{key} must have {' or '.join(prop['enum'])} but have {value}")
+            if validate:
+                validate(value)
+
+        def check_column(values):
+            # True when all the values are valid, False when they must be checked one by one to find the errors
+            if flags_error or (has_enum and enum is None):
+                return False
+            if nested is not None:
+                if any(type(v) is not dict for v in values) or nested.validate_many(values)[1]:
+                    return False
+            if nullable:
+                values = [v for v in values if v is not None]
+            if not values:
+                return True
+            try:
+                if column_type_check and not column_type_check(values):
+                    return False
+                if has_enum and not (enum.issuperset(values) if type(enum) is frozenset
+                                     else all(v in enum for v in values)):
+                    return False
+                if bounded:
+                    if min(values) < validator.min_value or max(values) > validator.max_value:
+                        return False
+                elif validate:
+                    for v in set(values):
+                        validate(v)
+            except (TypeError, ValueError):
+                return False
+            return True
+
+        return check, check_column, load_only
+
+    @classmethod
+    def __compile_type_check(cls, type_, items=None):
+        if type_ == 'array':
+            item_check = None
+            if inspect.isclass(items) and items.__name__ in REGISTRY_SCHEMA:
+                if items.type == 'object':
+                    def item_check(key, value):
+                        items(**value)
+                else:
+                    item_check = cls.__compile_type_check(items.type, items.definitions().get('items', None))
+            elif isinstance(items, dict):
+                item_check = cls.__compile_type_check(items.get('type', None), items.get('items', None))
+
+            def check_array(key, value):
+                if not isinstance(value, list):
+                    raise ValueError(f'The attribute "{key}" must be a list, but was "{type(value)}')
+                if item_check:
+                    for v in value:
+                        item_check(key, v)
+
+            return check_array
+
+        if type_ in _TYPE_CHECKS:
+            python_types, name = _TYPE_CHECKS[type_]
+
+            def check_type(key, value):
+                if not isinstance(value, python_types):
+                    raise ValueError(f'The attribute "{key}" must be {name}, but was "{type(value)}"')
+
+            return check_type
+
+        return None
+
+    @classmethod
+    def __compile_column_type_check(cls, type_, items=None):
+        """
+        Returns the check of a column of values of type_, True when all of them are valid
+        """
+        if type_ == 'array':
+            item_check = None
+            if inspect.isclass(items) and items.__name__ in REGISTRY_SCHEMA:
+                if items.type == 'object':
+                    def item_check(values):
+                        return all(type(v) is dict for v in values) and not items.validate_many(values)[1]
+                else:
+                    item_check = cls.__compile_column_type_check(items.type, items.definitions().get('items', None))
+            elif isinstance(items, dict):
+                item_check = cls.__compile_column_type_check(items.get('type', None), items.get('items', None))
+
+            def check_arrays(values):
+                if not all(issubclass(t, list) for t in set(map(type, values))):
+                    return False
+                return item_check is None or item_check([v for value in values for v in value])
+
+            return check_arrays
+
+        if type_ in _TYPE_CHECKS:
+            python_types = _TYPE_CHECKS[type_][0]
+
+            def check_types(values):
+                return all(issubclass(t, python_types) for t in set(map(type, values)))
+
+            return check_types
+
+        return None
+
+    @classmethod
+    def __get_flags(cls, prop):
+        nullable = cls.__get_boolean_attribute(prop, 'nullable')
+        load_only = cls.__get_boolean_attribute(prop, 'load_only')
+        dump_only = cls.__get_boolean_attribute(prop, 'dump_only')
+        if load_only and dump_only:
+            raise TypeError('A value can\'t be load_only and dump_only in the same schema')
+        return nullable, load_only
+
+    @staticmethod
+    def __get_enum(prop, type_check):
+        if type(prop['enum']) not in [set, list, tuple]:
+            raise TypeError(f"'enum' must be 'list', 'set' or 'tuple',"
+                            f"but was {type(prop['enum'])}")
+        if type_check:
+            for item in list(prop['enum']):
+                type_check('enum', item)
+        return prop['enum']
+
+    @staticmethod
+    def __get_boolean_attribute(prop, attr):
         _attr = False
-        if attr in self.prop:
-            if self.prop[attr] not in ['true', 'false', True, False]:
+        if attr in prop:
+            if prop[attr] not in ['true', 'false', True, False]:
                 raise ValueError(f'"{attr}" must be "true", "false", True, False')
-            if self.prop[attr] == 'true' or self.prop[attr]:
+            if prop[attr] == 'true' or prop[attr]:
                 _attr = True
 
         return _attr
@@ -656,39 +1266,11 @@ class Schema(dict):
 
     @classmethod
     def get_super_classes(cls):
-        return [
-            schema for schema_name, schema in REGISTRY_SCHEMA.items()
-            if schema_name != cls.__name__ and issubclass(cls, schema)
-        ]
-
-    def check_type(self, type_, key, value):
-        if type_:
-            if type_ == 'array':
-                if not isinstance(value, list):
-                    raise ValueError(f'The attribute "{key}" must be a list, but was "{type(value)}')
-                cls = self.properties[key].get('items')
-                if cls and cls.__name__ in REGISTRY_SCHEMA:
-                    if cls.type == 'object':
-                        for v in value:
-                            cls(**v)
-                    else:
-                        for v in value:
-                            self.check_type(cls.type,  key, v)
-            if type_ == 'integer' and not isinstance(value, int):
-                raise ValueError(f'The attribute "{key}" must be an int, but was "{type(value)}"')
-            if type_ == 'number' and not isinstance(value, int) and not isinstance(value, float):
-                raise ValueError(
-                    f'The attribute "{key}" must be an int or float, but was "{type(value)}"')
-            if type_ == 'string' and not isinstance(value, str):
-                raise ValueError(f'The attribute "{key}" must be a string, but was "{type(value)}"')
-            if type_ == 'boolean' and not isinstance(value, bool):
-                raise ValueError(f'The attribute "{key}" must be a bool, but was "{type(value)}"')
-
-    @staticmethod
-    def check_format(type_, format_, value):
-        validator = get_validate_format(type_, format_)
-        if validator:
-            validator().validate(value)
+        """
+        Returns the registered schemas cls inherits from, in their registration order
+        """
+        super_classes = [schema for schema in cls.__mro__[1:] if REGISTRY_SCHEMA.get(schema.__name__) is schema]
+        return sorted(super_classes, key=lambda schema: _REGISTRY_INDEX.get(schema, -1))
 
     @classmethod
     def reference(cls):
@@ -768,12 +1350,245 @@ class ExampleEncoder(json.JSONEncoder):
         return obj.example()
 
 
+class RecordEncoder(json.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, SchemaRecord):
+            return dict(obj)
+        return super().default(obj)
+
+
+def _to_json(obj, default):
+    """
+    Converts obj to plain json data, as json.loads(json.dumps(obj)) would, without serializing it.
+    :param obj: The object to convert
+    :param default: Function returning the json data of the objects json doesn't know
+    :return: The json data
+    """
+    if obj is None or obj is True or obj is False:
+        return obj
+    if isinstance(obj, str):
+        return obj if type(obj) is str else str.__str__(obj)
+    if isinstance(obj, int):
+        return obj if type(obj) is int else int(obj)
+    if isinstance(obj, float):
+        return obj if type(obj) is float else float(obj)
+    if isinstance(obj, (list, tuple)):
+        return [_to_json(v, default) for v in obj]
+    if isinstance(obj, dict):
+        return {k if isinstance(k, str) else json.dumps(k): _to_json(v, default) for k, v in obj.items()}
+    return default(obj)
+
+
+_JSON_DEFINITIONS = {}
+_JSON_EXAMPLES = {}
+
+
+def _copy_json(value):
+    """
+    Copies json data, as deepcopy would but only for the dicts and the lists
+    """
+    if type(value) is dict:
+        return {k: _copy_json(v) for k, v in value.items()}
+    if type(value) is list:
+        return [_copy_json(v) for v in value]
+    return value
+
+
+def _json_definitions(obj):
+    """
+    Returns the definitions of a schema as json data, computed once per schema class.
+    The returned data is shared, it must not be modified
+    """
+    if not inspect.isclass(obj):
+        return _to_json(obj.definitions(), _json_definitions)
+    if obj not in _JSON_DEFINITIONS:
+        _JSON_DEFINITIONS[obj] = _to_json(obj.definitions(), _json_definitions)
+    return _JSON_DEFINITIONS[obj]
+
+
+def _json_example(obj):
+    """
+    Returns the example of a schema as json data, computed once per schema class.
+    The returned data is shared, it must not be modified
+    """
+    if not inspect.isclass(obj):
+        return _to_json(obj.example(), _json_example)
+    if obj not in _JSON_EXAMPLES:
+        _JSON_EXAMPLES[obj] = _to_json(obj.example(), _json_example)
+    return _JSON_EXAMPLES[obj]
+
+
+_DOC_ATTRIBUTES = ("__response_code", "__description", "__schema", "__request_body", "__params", "__reqparser",
+                   "__tags", "__no_content", "__custom_example", "__summary", "__security")
+
+
+class _Unfingerprintable(Exception):
+    """Raised by _fingerprint_json for a value which isn't the same from one process to another"""
+
+
+def _fingerprint_json(obj):
+    """
+    Returns json data identifying an object of the documentation metadata, the schemas by their definitions.
+    It must be the same in every process: the sets are sorted, and the objects without their own __repr__,
+    which would give their address, raise _Unfingerprintable
+    """
+    if inspect.isclass(obj) and REGISTRY_SCHEMA.get(obj.__name__) is obj:
+        return {obj.__name__: _json_definitions(obj)}
+    if callable(obj) and hasattr(obj, '__qualname__'):
+        return f'{obj.__module__}.{obj.__qualname__}'
+    if isinstance(obj, (set, frozenset)):
+        items = [_to_json(item, _fingerprint_json) for item in obj]
+        return sorted(items, key=lambda item: json.dumps(item, sort_keys=True))
+    if hasattr(obj, '__dict__'):
+        return _to_json(vars(obj), _fingerprint_json)
+    if type(obj).__repr__ is object.__repr__:
+        raise _Unfingerprintable(type(obj).__qualname__)
+    return repr(obj)
+
+
+def _digest(data):
+    """
+    :return: The sha256 hex digest of json data, which can hold schemas and functions, see _fingerprint_json
+    """
+    return hashlib.sha256(json.dumps(_to_json(data, _fingerprint_json), sort_keys=True).encode()).hexdigest()
+
+
+def _fingerprint(resource, urls, url_prefix=None):
+    """
+    Computes a digest of what the documentation of a resource is built from
+    :param resource: The resource
+    :param urls: The urls of the resource
+    :param url_prefix: The url prefix of the blueprint of the Api
+    :return: The sha256 hex digest, None when the metadata holds a value which can't be fingerprinted
+    """
+    methods = {}
+    for method in sorted(m.lower() for m in resource.methods or ()):
+        f = resource.__dict__.get(method, None)
+        if f:
+            methods[method] = {k: f.__dict__[k] for k in _DOC_ATTRIBUTES if k in f.__dict__}
+    try:
+        return _digest({"urls": urls, "url_prefix": url_prefix, "methods": methods})
+    except _Unfingerprintable:
+        return None
+
+
+def _operation_keys(resource, urls, url_prefix=None):
+    """
+    Lists the operations the documentation of a resource adds, without building it
+    :param resource: The resource
+    :param urls: The urls of the resource
+    :param url_prefix: The url prefix of the blueprint of the Api
+    :return: The [path, method] of each operation
+    """
+    methods = [m for m in sorted(m.lower() for m in resource.methods or ())
+               if m in resource.__dict__ and resource.__dict__[m].__dict__.get("__response_code")]
+    return [[extract_swagger_path((url_prefix or "") + url)[0], method] for url in urls for method in methods]
+
+
+_PRECOMPRESSED_ASSETS = ('swagger-ui-bundle.js', 'swagger-ui-standalone-preset.js', 'swagger-ui.js', 'swagger-ui.css')
+_IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def _gzip(data):
+    import gzip
+    import io
+
+    buffer = io.BytesIO()
+    # A fixed mtime keeps the compressed bytes stable between builds
+    with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=9, mtime=0) as f:
+        f.write(data)
+    return buffer.getvalue()
+
+
+class _StaticAssets:
+    """
+    Precompressed swagger-ui assets, built on first use.
+    Each asset is served under its own name and under a fingerprinted name which can be cached forever.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.__assets = None
+        self.__lock = Lock()
+
+    @property
+    def assets(self):
+        if self.__assets is None:
+            with self.__lock:
+                if self.__assets is None:
+                    self.__assets = self.__build()
+        return self.__assets
+
+    def __build(self):
+        import mimetypes
+        try:
+            import brotli
+        except ImportError:
+            brotli = None
+
+        assets = {}
+        for filename in _PRECOMPRESSED_ASSETS:
+            with open(os.path.join(self.folder, filename), 'rb') as f:
+                data = f.read()
+            encodings = {'identity': data, 'gzip': _gzip(data)}
+            if brotli is not None:
+                encodings['br'] = brotli.compress(data)
+            fingerprint = hashlib.sha256(data).hexdigest()[:16]
+            stem, extension = os.path.splitext(filename)
+            asset = {
+                'fingerprint': fingerprint,
+                'url': '{}.{}{}'.format(stem, fingerprint, extension),
+                'mimetype': mimetypes.guess_type(filename)[0],
+                'encodings': encodings,
+                'immutable': False
+            }
+            assets[filename] = asset
+            assets[asset['url']] = dict(asset, immutable=True)
+        return assets
+
+    def urls(self):
+        """
+        Returns the fingerprinted url of every asset
+        :return: A mapping of file name to url
+        """
+        return {filename: self.assets[filename]['url'] for filename in _PRECOMPRESSED_ASSETS}
+
+    def send(self, path):
+        """
+        Builds the response of an asset in the best encoding accepted by the request
+        :param path: The requested path
+        :return: The response, or None when the path isn't a precompressed asset
+        """
+        asset = self.assets.get(path)
+        if asset is None:
+            return None
+
+        encoding = 'identity'
+        for candidate in ('br', 'gzip'):
+            if candidate in asset['encodings'] and request.accept_encodings[candidate]:
+                encoding = candidate
+                break
+
+        response = current_app.response_class(asset['encodings'][encoding], mimetype=asset['mimetype'])
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        response.set_etag('{}-{}'.format(asset['fingerprint'], encoding))
+        if asset['immutable']:
+            response.headers['Cache-Control'] = _IMMUTABLE_CACHE_CONTROL
+        else:
+            response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+
 def get_swagger_blueprint(
         swagger_object,
         swagger_prefix_url="/api/doc",
         swagger_url="/swagger.json",
         config=None,
         oauth_config=None,
+        precompressed_static=False,
+        spec_cache_control=None,
         **kwargs):
     """
     Returns a Flask blueprint to serve the given list of swagger document objects.
@@ -782,6 +1597,8 @@ def get_swagger_blueprint(
     :param swagger_url: The URL that serves the swagger specification document
     :param config: Additional config
     :param oauth_config
+    :param precompressed_static: Serve the swagger-ui assets compressed, with fingerprinted urls and immutable caching
+    :param spec_cache_control: Cache-Control header of the swagger specification document
     :return: A Flask blueprint
     """
 
@@ -820,6 +1637,7 @@ def get_swagger_blueprint(
     fields = {
         # Some fields are used directly in template
         'base_url': blueprint_url_prefix,
+        'static_urls': {filename: filename for filename in _PRECOMPRESSED_ASSETS},
         'app_name': default_config.pop('app_name'),
         # Rest are just serialized into json string for inclusion in the .js file
         'config_json': json.dumps(default_config),
@@ -828,9 +1646,13 @@ def get_swagger_blueprint(
     if oauth_config:
         fields['oauth_config_json'] = json.dumps(oauth_config)
 
-    api.add_resource(create_open_api_resource(swagger_object),
+    api.add_resource(create_open_api_resource(swagger_object, cache_control=spec_cache_control),
                      new_url)
 
+    # A bit of a hack to not pollute the default /static path with our files.
+    static_folder = os.path.join(blueprint.root_path, blueprint._static_folder)
+    static_assets = _StaticAssets(static_folder) if precompressed_static else None
+
     @blueprint.route('/', strict_slashes=False)
     @blueprint.route('/<path:path>', strict_slashes=False)
     def show(path=None):
@@ -840,16 +1662,14 @@ def get_swagger_blueprint(
                     {"oauth2RedirectUrl": os.path.join(request.base_url, "oauth2-redirect.html")}
                 )
                 fields['config_json'] = json.dumps(default_config)
+            if static_assets is not None:
+                fields['static_urls'] = static_assets.urls()
             return render_template('index.template.html', **fields)
-        else:
-            return send_from_directory(
-                # A bit of a hack to not pollute the default /static path with our files.
-                os.path.join(
-                    blueprint.root_path,
-                    blueprint._static_folder
-                ),
-                path
-            )
+        if static_assets is not None:
+            response = static_assets.send(path)
+            if response is not None:
+                return response
+        return send_from_directory(static_folder, path)
 
     return blueprint
 
@@ -0,0 +1,75 @@
+"""
+Command line of flask-restful-swagger-3.
+
+    python -m flask_restful_swagger_3 export myapp:api --out spec.json
+
+imports the module myapp, validates the document of its Api `api` and writes it with its sha256 in spec.json.sha256.
+The written file can be loaded back with Api(..., spec_snapshot="spec.json").
+"""
+import argparse
+import importlib
+import os
+import sys
+
+from flask_restful_swagger_3 import Api
+from flask_restful_swagger_3.swagger import ValidationError, export_swagger_doc
+
+
+def load_api(target):
+    """
+    Imports an Api
+    :param target: "module:name", name is an Api or a function without argument returning one (default: "api")
+    :return: The Api
+    """
+    module_name, _, name = target.partition(':')
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    module = importlib.import_module(module_name)
+    api = getattr(module, name or 'api')
+    if not isinstance(api, Api) and callable(api):
+        api = api()
+    if not isinstance(api, Api):
+        raise TypeError('"{0}" is not an Api but a {1}'.format(target, type(api)))
+    return api
+
+
+def export(args):
+    api = load_api(args.api)
+    try:
+        api.finalize()
+    except ValidationError as e:
+        for error in e.errors:
+            sys.stderr.write('{0}: {1}\n'.format(error['path'] or '/', error['message']))
+        return 1
+
+    data, digest = export_swagger_doc(api.open_api_object, fingerprints=api.fingerprints)
+    if args.out is None:
+        sys.stdout.buffer.write(data)
+        sys.stderr.write(digest + '\n')
+        return 0
+
+    with open(args.out, 'wb') as f:
+        f.write(data)
+    with open(args.hash_out or args.out + '.sha256', 'w') as f:
+        f.write('{0}  {1}\n'.format(digest, os.path.basename(args.out)))
+    sys.stdout.write('{0}  {1}\n'.format(digest, args.out))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m flask_restful_swagger_3')
+    # add_subparsers(required=True) needs python 3.7
+    commands = parser.add_subparsers(dest='command')
+    export_parser = commands.add_parser('export', help='Validates the document of an Api and writes it')
+    export_parser.add_argument('api', help='The Api, as "module:name"')
+    export_parser.add_argument('--out', help='The json file to write, the document is printed when not given')
+    export_parser.add_argument('--hash-out', help='The file to write the sha256 of the document to '
+                                                  '(default: the json file followed by .sha256)')
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.error('a command is required')
+    return export(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,64 +1,90 @@
 from http import HTTPStatus
 import re
 
-info_object_list = ['title', 'description', 'termsOfService', 'contact', 'license', 'version']
+info_object_list = ('title', 'description', 'termsOfService', 'contact', 'license', 'version')
 
-contact_object_list = ['name', 'url', 'email']
+contact_object_list = ('name', 'url', 'email')
 
-license_object_list = ['name', 'url']
+license_object_list = ('name', 'url')
 
-parameter_object_list = ['name', 'in', 'description', 'required', 'deprecated', 'allowEmptyValue',
+parameter_object_list = ('name', 'in', 'description', 'required', 'deprecated', 'allowEmptyValue',
                          'style', 'explode', 'allowReserved', 'schema', 'example', 'examples', 'content', 'matrix',
-                         'label', 'form', 'simple', 'spaceDelimited', 'pipeDelimited', 'deepObject']
-
-unassigned_code = list(range(104, 200)) + list(range(209, 226)) + list(range(227, 300)) + \
-                  list(range(309, 400)) + list(range(419, 421)) + list(range(432, 451)) + \
-                  list(range(452, 500)) + list(range(512, 600))
-http_status_enum = [status for status in HTTPStatus]
-http_status_value = [status.value for status in HTTPStatus]
-responses_object_list = list(set(http_status_enum + http_status_value + unassigned_code))
-
-operation_object_list = ['get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'trace']
-
-security_scheme_list = ['type', 'description', 'name', 'in', 'scheme', 'bearerFormat', 'flows', 'openIdConnectUrl']
-
-security_scheme_object_scheme_list = ['basic', 'bearer', 'digest', 'HOBA', 'mutual', 'negotiate',
-                                      'oauth', 'SCRAM-SHA-1', 'SCRAM-SHA-256', 'vapid']
-
-
-security_scheme_object_type_list = ["apiKey", "http", "oauth2", "openIdConnect"]
-
-oauth_flows_object_list = ['implicit', 'password', 'clientCredentials', 'authorizationCode']
-
-oauth_flows_object_sub_level_list = ['authorizationUrl', 'tokenUrl', 'refreshUrl', 'scopes']
-
-components_object_list = ['schemas', 'responses', 'parameters', 'examples', 'requestBodies',
-                          'headers', 'securitySchemes', 'links', 'callbacks']
-
-
-headers_object_list = ['name', 'in', 'description', 'required', 'deprecated', 'allowEmptyValue', 'style', 'explode',
+                         'label', 'form', 'simple', 'spaceDelimited', 'pipeDelimited', 'deepObject')
+
+unassigned_code = (tuple(range(104, 200)) + tuple(range(209, 226)) + tuple(range(227, 300)) + tuple(range(309, 400)) +
+                   tuple(range(419, 421)) + tuple(range(432, 451)) + tuple(range(452, 500)) + tuple(range(512, 600)))
+http_status_enum = tuple(HTTPStatus)
+http_status_value = tuple(status.value for status in http_status_enum)
+# the codes of http.HTTPStatus and the unassigned codes, written out so that importing the module doesn't merge them
+responses_object_list = (
+    100, 101, 102, 103, 104, 105, 106, 107, 108, 109, 110, 111, 112, 113, 114, 115, 116, 117, 118, 119,
+    120, 121, 122, 123, 124, 125, 126, 127, 128, 129, 130, 131, 132, 133, 134, 135, 136, 137, 138, 139,
+    140, 141, 142, 143, 144, 145, 146, 147, 148, 149, 150, 151, 152, 153, 154, 155, 156, 157, 158, 159,
+    160, 161, 162, 163, 164, 165, 166, 167, 168, 169, 170, 171, 172, 173, 174, 175, 176, 177, 178, 179,
+    180, 181, 182, 183, 184, 185, 186, 187, 188, 189, 190, 191, 192, 193, 194, 195, 196, 197, 198, 199,
+    200, 201, 202, 203, 204, 205, 206, 207, 208, 209, 210, 211, 212, 213, 214, 215, 216, 217, 218, 219,
+    220, 221, 222, 223, 224, 225, 226, 227, 228, 229, 230, 231, 232, 233, 234, 235, 236, 237, 238, 239,
+    240, 241, 242, 243, 244, 245, 246, 247, 248, 249, 250, 251, 252, 253, 254, 255, 256, 257, 258, 259,
+    260, 261, 262, 263, 264, 265, 266, 267, 268, 269, 270, 271, 272, 273, 274, 275, 276, 277, 278, 279,
+    280, 281, 282, 283, 284, 285, 286, 287, 288, 289, 290, 291, 292, 293, 294, 295, 296, 297, 298, 299,
+    300, 301, 302, 303, 304, 305, 307, 308, 309, 310, 311, 312, 313, 314, 315, 316, 317, 318, 319, 320,
+    321, 322, 323, 324, 325, 326, 327, 328, 329, 330, 331, 332, 333, 334, 335, 336, 337, 338, 339, 340,
+    341, 342, 343, 344, 345, 346, 347, 348, 349, 350, 351, 352, 353, 354, 355, 356, 357, 358, 359, 360,
+    361, 362, 363, 364, 365, 366, 367, 368, 369, 370, 371, 372, 373, 374, 375, 376, 377, 378, 379, 380,
+    381, 382, 383, 384, 385, 386, 387, 388, 389, 390, 391, 392, 393, 394, 395, 396, 397, 398, 399, 400,
+    401, 402, 403, 404, 405, 406, 407, 408, 409, 410, 411, 412, 413, 414, 415, 416, 417, 418, 419, 420,
+    421, 422, 423, 424, 425, 426, 428, 429, 431, 432, 433, 434, 435, 436, 437, 438, 439, 440, 441, 442,
+    443, 444, 445, 446, 447, 448, 449, 450, 451, 452, 453, 454, 455, 456, 457, 458, 459, 460, 461, 462,
+    463, 464, 465, 466, 467, 468, 469, 470, 471, 472, 473, 474, 475, 476, 477, 478, 479, 480, 481, 482,
+    483, 484, 485, 486, 487, 488, 489, 490, 491, 492, 493, 494, 495, 496, 497, 498, 499, 500, 501, 502,
+    503, 504, 505, 506, 507, 508, 510, 511, 512, 513, 514, 515, 516, 517, 518, 519, 520, 521, 522, 523,
+    524, 525, 526, 527, 528, 529, 530, 531, 532, 533, 534, 535, 536, 537, 538, 539, 540, 541, 542, 543,
+    544, 545, 546, 547, 548, 549, 550, 551, 552, 553, 554, 555, 556, 557, 558, 559, 560, 561, 562, 563,
+    564, 565, 566, 567, 568, 569, 570, 571, 572, 573, 574, 575, 576, 577, 578, 579, 580, 581, 582, 583,
+    584, 585, 586, 587, 588, 589, 590, 591, 592, 593, 594, 595, 596, 597, 598, 599,
+)
+
+operation_object_list = ('get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'trace')
+
+security_scheme_list = ('type', 'description', 'name', 'in', 'scheme', 'bearerFormat', 'flows', 'openIdConnectUrl')
+
+security_scheme_object_scheme_list = ('basic', 'bearer', 'digest', 'HOBA', 'mutual', 'negotiate',
+                                      'oauth', 'SCRAM-SHA-1', 'SCRAM-SHA-256', 'vapid')
+
+
+security_scheme_object_type_list = ("apiKey", "http", "oauth2", "openIdConnect")
+
+oauth_flows_object_list = ('implicit', 'password', 'clientCredentials', 'authorizationCode')
+
+oauth_flows_object_sub_level_list = ('authorizationUrl', 'tokenUrl', 'refreshUrl', 'scopes')
+
+components_object_list = ('schemas', 'responses', 'parameters', 'examples', 'requestBodies',
+                          'headers', 'securitySchemes', 'links', 'callbacks')
+
+
+headers_object_list = ('name', 'in', 'description', 'required', 'deprecated', 'allowEmptyValue', 'style', 'explode',
                        'allowReserved', 'schema', 'example', 'examples', 'content', 'matrix', 'label', 'form',
-                       'simple', 'spaceDelimited', 'pipeDelimited', 'deepObject']
+                       'simple', 'spaceDelimited', 'pipeDelimited', 'deepObject')
 
-link_object_list = ['operationRef', 'operationId', 'parameters', 'requestBody', 'description', 'server']
+link_object_list = ('operationRef', 'operationId', 'parameters', 'requestBody', 'description', 'server')
 
 
-server_object_list = ['url', 'description', 'variables']
+server_object_list = ('url', 'description', 'variables')
 
 
-server_variables_object_list = ['enum', 'default', 'description']
+server_variables_object_list = ('enum', 'default', 'description')
 
 
-example_object_list = ['summary', 'description', 'value', 'externalValue']
+example_object_list = ('summary', 'description', 'value', 'externalValue')
 
 
-open_api_object_list = ['openapi', 'info', 'servers', 'paths', 'components', 'security', 'tags', 'externalDocs']
+open_api_object_list = ('openapi', 'info', 'servers', 'paths', 'components', 'security', 'tags', 'externalDocs')
 
 
-tag_object_list = ['name', 'description', 'externalDocs']
+tag_object_list = ('name', 'description', 'externalDocs')
 
 
-external_doc_object_list = ['description', 'url']
+external_doc_object_list = ('description', 'url')
 
 
 class TypeSwagger:
@@ -76,13 +102,27 @@ class TypeSwagger:
             return cls.__dict__[_type]
 
 
+class _LazyRegex:
+    """Compiles a regex on its first use"""
+
+    def __init__(self, pattern, flags=0):
+        self.pattern = pattern
+        self.flags = flags
+        self.regex = None
+
+    def __get__(self, obj, owner=None):
+        if self.regex is None:
+            self.regex = re.compile(self.pattern, self.flags)
+        return self.regex
+
+
 class Regex:
-    email = re.compile(
+    email = _LazyRegex(
         r"(^[-!#$%&'*+/=?^_`{}|~0-9A-Z]+(\.[-!#$%&'*+/=?^_`{}|~0-9A-Z]+)*"  # dot-atom
         r'|^"([\001-\010\013\014\016-\037!#-\[\]-\177]|\\[\001-011\013\014\016-\177])*"'  # quoted-string
         r')@(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?$', re.IGNORECASE)  # domain
 
-    url = re.compile(
+    url = _LazyRegex(
         r'^(?:http|ftp)s?://'  # http:// or https://
         r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'  # domain...
         r'localhost|'  # localhost...
@@ -92,4 +132,4 @@ class Regex:
 
     path = r"<(?:[^:]+:)?([^>]+)>"
 
-    media_type = re.compile(r"[a-zA-Z0-9!#$%^&\*_\+{}\|'.`~]+/[a-zA-Z0-9!#$%^&\*_\+{}\|'.; =`~-]+", re.IGNORECASE)
+    media_type = _LazyRegex(r"[a-zA-Z0-9!#$%^&\*_\+{}\|'.`~]+/[a-zA-Z0-9!#$%^&\*_\+{}\|'.; =`~-]+", re.IGNORECASE)
@@ -0,0 +1,128 @@
+"""
+Profiling of the registration of the resources, see Api(profile_registration=True).
+
+Each phase of the documentation of a resource is timed and its memory allocations are traced with tracemalloc:
+    - time: the seconds spent in the phase
+    - size: the bytes allocated by the phase and still allocated at its end
+    - peak: the highest number of bytes allocated during the phase, None before python 3.9
+The phases can be nested, e.g. __build_model is called by __build_request_body, the figures of a phase include
+the ones of the phases it calls.
+"""
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+_REPORT_FIELDS = ['resource', 'urls', 'phase', 'calls', 'time', 'size', 'peak']
+
+# python < 3.9 can't measure the peak of each phase
+_reset_peak = getattr(tracemalloc, 'reset_peak', None)
+
+
+class _Measure:
+    __slots__ = ('start', 'size', 'peak')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        # peak is the highest absolute size traced since the start
+        self.size, self.peak = tracemalloc.get_traced_memory()
+
+
+class RegistrationProfiler:
+    """
+    Collects the figures of the registration phases of each resource
+    """
+
+    def __init__(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.__resources = []
+        self.__measures = []
+
+    @staticmethod
+    def __figures():
+        return {'calls': 0, 'time': 0.0, 'size': 0, 'peak': None}
+
+    def __start(self):
+        if _reset_peak:
+            if self.__measures:
+                # the peak traced until now belongs to the enclosing measure
+                self.__measures[-1].peak = max(self.__measures[-1].peak, tracemalloc.get_traced_memory()[1])
+            _reset_peak()
+        self.__measures.append(_Measure())
+
+    def __stop(self, figures):
+        measure = self.__measures.pop()
+        size, peak = tracemalloc.get_traced_memory()
+        figures['calls'] += 1
+        figures['time'] += time.perf_counter() - measure.start
+        figures['size'] += size - measure.size
+        if _reset_peak:
+            measure.peak = max(measure.peak, peak)
+            figures['peak'] = max(figures['peak'] or 0, measure.peak - measure.size)
+            if self.__measures:
+                self.__measures[-1].peak = max(self.__measures[-1].peak, measure.peak)
+
+    @contextmanager
+    def resource(self, resource, urls):
+        """
+        Profiles the registration of a resource
+        :param resource: The resource class
+        :param urls: The urls of the resource
+        """
+        record = {'resource': resource.__name__, 'urls': list(urls), 'phases': {}}
+        record.update(self.__figures())
+        self.__resources.append(record)
+        self.__start()
+        try:
+            yield
+        finally:
+            self.__stop(record)
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Profiles a phase of the registration of the current resource
+        :param name: The name of the phase
+        """
+        if not self.__measures:
+            # outside of the registration of a resource
+            yield
+            return
+        figures = self.__resources[-1]['phases'].setdefault(name, self.__figures())
+        self.__start()
+        try:
+            yield
+        finally:
+            self.__stop(figures)
+
+    def report(self):
+        """
+        :return: A list with the figures of each registered resource, in their registration order,
+        with the figures of their phases in "phases"
+        """
+        return [dict(record, phases={k: dict(v) for k, v in record['phases'].items()}) for record in self.__resources]
+
+    def export(self, path, format='json'):
+        """
+        Writes the report
+        :param path: The file to write
+        :param format: "json" or "csv", a row per resource (its phase is "total") and per phase
+        """
+        if format == 'json':
+            with open(path, 'w') as f:
+                json.dump(self.report(), f, indent=2)
+        elif format == 'csv':
+            import csv
+
+            with open(path, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=_REPORT_FIELDS)
+                writer.writeheader()
+                for record in self.report():
+                    phases = record.pop('phases')
+                    urls = ' '.join(record.pop('urls'))
+                    writer.writerow(dict(record, urls=urls, phase='total'))
+                    for name, figures in phases.items():
+                        writer.writerow(dict(figures, resource=record['resource'], urls=urls, phase=name))
+        else:
+            raise ValueError(f'Unknown report format "{format}", use "json" or "csv"')
@@ -1,18 +1,25 @@
 import collections
+import json
 import re
+import hashlib
 import inspect
-from functools import wraps
-from http import HTTPStatus
+from functools import wraps, lru_cache
+from threading import Lock
+from time import monotonic
 
-from flask import request
-from flask_restful import Resource, reqparse, inputs
+from flask import request, current_app
+from flask_restful import Resource, abort
+from werkzeug.wrappers import Response as ResponseBase
 from flask_restful_swagger_3 import constants
 
 REGISTRY_SCHEMA = {}
 
 
 class ValidationError(ValueError):
-    pass
+    def __init__(self, message, errors=None):
+        super().__init__(message)
+        # all the errors found, as dicts with a "path" (JSON pointer) and a "message"
+        self.errors = errors if errors is not None else [{'path': '', 'message': message}]
 
 
 def auth(api_key, endpoint, method):
@@ -27,38 +34,475 @@ def _auth(*args, **kwargs):
     return auth(*args, **kwargs)
 
 
-def create_open_api_resource(swagger_object):
-    """Creates a flask_restful api endpoint for the swagger spec"""
+_default_auth = auth
+
+# Set this function in your application to filter the documentation with a single call:
+# auth_many(api_key, [(endpoint, method), ...]) returns the set of the (endpoint, method) api_key is allowed to call.
+# It replaces `auth` for the documentation only, the requests are still checked by `auth`.
+auth_many = None
+
+
+def is_auth_overridden():
+    """Returns True when the application has replaced the default `auth` function or has set `auth_many`"""
+    return auth is not _default_auth or auth_many is not None
+
+
+def get_allowed_operations(swagger_object, api_key):
+    """
+    Calls `auth_many` once, or `auth` for each operation of the swagger document when `auth_many` isn't set.
+    :param swagger_object: The swagger document
+    :param api_key: The api_key passed to `auth`
+    :return: The frozenset of (path, method) api_key is allowed to call
+    """
+    operations = [(endpoint, method)
+                  for endpoint, view in swagger_object.get('paths', {}).items()
+                  for method in view]
+    if auth_many is not None:
+        return frozenset(auth_many(api_key, operations)).intersection(operations)
+    return frozenset(operation for operation in operations if auth(api_key, *operation))
+
+
+def get_swagger_doc(swagger_object, api_key=None, check_auth=True, operations=None, schemas=None):
+    """
+    Builds the document served by the swagger endpoint.
+    Fields with empty values are removed, paths are sorted and, when check_auth is True,
+    the operations api_key is not allowed to call are filtered out.
+    :param swagger_object: The swagger document
+    :param api_key: The api_key passed to `auth`
+    :param check_auth: Whether `auth` must be called for each operation
+    :param operations: The allowed operations, as returned by get_allowed_operations. Replaces the calls to `auth`
+    :param schemas: The names of the components/schemas to keep, all of them are kept when not given
+    :return: The swagger document to serve
+    """
+    swagger_doc = {}
+    # filter keys with empty values
+
+    for k, v in swagger_object.items():
+        if v or k == 'paths':
+            if k == 'paths':
+                paths = {}
+                for endpoint, view in v.items():
+                    views = {}
+                    for method, docs in view.items():
+                        # check permissions. If a user has not access to an api, do not show the docs of it
+                        if operations is not None:
+                            allowed = (endpoint, method) in operations
+                        else:
+                            allowed = not check_auth or auth(api_key, endpoint, method)
+                        if allowed:
+                            views[method] = docs
+                    if views:
+                        paths[endpoint] = views
+                swagger_doc['paths'] = collections.OrderedDict(sorted(paths.items()))
+            elif k == 'components' and schemas is not None and 'schemas' in v:
+                swagger_doc[k] = dict(v, schemas={name: schema for name, schema in v['schemas'].items()
+                                                  if name in schemas})
+            else:
+                swagger_doc[k] = v
+
+        if k == 'servers':
+            validate_servers_object(v)
+
+        if k == 'info':
+            validate_info_object(v)
+            continue
+
+    return swagger_doc
+
+
+_SCHEMA_REF_PREFIX = '#/components/schemas/'
+
+
+def _iter_schema_refs(value):
+    """
+    Yields the names of the components/schemas referenced by value and its children
+    """
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            ref = value.get('$ref')
+            if isinstance(ref, str) and ref.startswith(_SCHEMA_REF_PREFIX):
+                name = ref[len(_SCHEMA_REF_PREFIX):].split('/', 1)[0]
+                yield name.replace('~1', '/').replace('~0', '~')
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+
+
+_ARRAY_INDEX = re.compile(r'0|[1-9][0-9]*')
+
+
+def _pointer_tokens(pointer):
+    if not pointer.startswith('/'):
+        raise ValueError(f'Invalid JSON pointer "{pointer}", it must start with a "/"')
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer[1:].split('/')]
+
+
+def _resolve_tokens(document, tokens, pointer):
+    for token in tokens:
+        if isinstance(document, dict):
+            if token in document:
+                document = document[token]
+                continue
+            # the keys which aren't strings, e.g. the response codes, are matched as json serializes them
+            keys = [key for key in document if not isinstance(key, str) and json.dumps(key) == token]
+            if not keys:
+                raise KeyError(pointer)
+            document = document[keys[0]]
+        elif isinstance(document, (list, tuple)) and _ARRAY_INDEX.fullmatch(token) and int(token) < len(document):
+            document = document[int(token)]
+        else:
+            raise KeyError(pointer)
+    return document
+
+
+def resolve_json_pointer(document, pointer):
+    """
+    Resolves a JSON pointer (RFC 6901)
+    :param document: The json data, the keys which aren't strings are matched as they are serialized
+    :param pointer: The pointer, "" for the whole document
+    :return: The value the pointer refers to
+    :raise ValueError: When the pointer doesn't start with a "/"
+    :raise KeyError: When the pointer doesn't refer to a value of the document
+    """
+    if pointer == '':
+        return document
+    return _resolve_tokens(document, _pointer_tokens(pointer), pointer)
+
+
+def resolve_swagger_pointer(swagger_object, pointer, operations=None, schemas=None):
+    """
+    Resolves a JSON pointer in the document get_swagger_doc builds, without building it:
+    the operations and the schemas are filtered on the way
+    :param swagger_object: The swagger document
+    :param pointer: The pointer, "" for the whole document
+    :param operations: The allowed operations, as returned by get_allowed_operations, all of them when not given
+    :param schemas: The names of the components/schemas to keep, all of them when not given
+    :return: The value the pointer refers to, shared with swagger_object
+    :raise ValueError: When the pointer doesn't start with a "/"
+    :raise KeyError: When the pointer doesn't refer to a value of the document
+    """
+    if pointer == '':
+        return get_swagger_doc(swagger_object, check_auth=False, operations=operations, schemas=schemas)
+
+    tokens = _pointer_tokens(pointer)
+    key = tokens[0]
+    # the fields with empty values aren't served
+    if key not in swagger_object or not (swagger_object[key] or key == 'paths'):
+        raise KeyError(pointer)
+    value = swagger_object[key]
+
+    if key == 'paths':
+        if len(tokens) == 1:
+            return get_swagger_doc({key: value}, check_auth=False, operations=operations)[key]
+        path = tokens[1]
+        view = {method: docs for method, docs in value.get(path, {}).items()
+                if operations is None or (path, method) in operations}
+        if not view:
+            raise KeyError(pointer)
+        return _resolve_tokens(view, tokens[2:], pointer)
+
+    if key == 'components' and schemas is not None:
+        if len(tokens) <= 2:
+            value = get_swagger_doc({key: value}, check_auth=False, schemas=schemas)[key]
+        elif tokens[1] == 'schemas' and tokens[2] not in schemas:
+            raise KeyError(pointer)
+    return _resolve_tokens(value, tokens[1:], pointer)
+
+
+def get_spec_index(swagger_object):
+    """
+    Indexes a swagger document to build its shards, see get_shard
+    :param swagger_object: The swagger document
+    :return: A dict with the frozenset of (path, method) operations of each tag in "tags", the schemas referenced
+    by each operation in "operations", by each schema in "schemas" and by the other components in "components"
+    """
+    tags = collections.defaultdict(set)
+    operations = {}
+    for endpoint, view in swagger_object.get('paths', {}).items():
+        for method, docs in view.items():
+            operations[(endpoint, method)] = frozenset(_iter_schema_refs(docs))
+            if isinstance(docs, dict):
+                for tag in docs.get('tags', ()):
+                    tags[tag].add((endpoint, method))
+
+    components = swagger_object.get('components', {})
+    schemas = {name: frozenset(_iter_schema_refs(schema)) for name, schema in components.get('schemas', {}).items()}
+    return {
+        'tags': {tag: frozenset(tag_operations) for tag, tag_operations in tags.items()},
+        'operations': operations,
+        'schemas': schemas,
+        'components': frozenset(_iter_schema_refs({k: v for k, v in components.items() if k != 'schemas'}))
+    }
+
+
+def get_shard(index, tags, operations=None):
+    """
+    Selects the operations of some tags and the schemas they need
+    :param index: The index of the swagger document, as returned by get_spec_index
+    :param tags: The names of the tags
+    :param operations: The allowed operations, as returned by get_allowed_operations, all of them when not given
+    :return: The frozenset of the (path, method) operations of the tags,
+    and the frozenset of the names of the schemas they reference, directly or through other schemas
+    """
+    selected = frozenset().union(*(index['tags'].get(tag, ()) for tag in tags))
+    if operations is not None:
+        selected = selected.intersection(operations)
+
+    pending = set(index['components'])
+    for operation in selected:
+        pending.update(index['operations'][operation])
+    schemas = set()
+    while pending:
+        name = pending.pop()
+        if name not in schemas:
+            schemas.add(name)
+            pending.update(index['schemas'].get(name, ()))
+    return selected, frozenset(schemas)
+
+
+# Number of auth-filtered documents kept per spec generation
+MAX_COMPILED_DOCS = 64
+
+# Number of fragments of the documents, see resolve_swagger_pointer, kept per spec generation
+MAX_COMPILED_FRAGMENTS = 1024
+
+# Size of the chunks of a streamed document
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Nesting level down to which the large fields of a streamed document are split: each path, each component
+STREAM_DEPTHS = {'paths': 1, 'components': 2}
+
+
+def serialize_swagger_doc(swagger_doc):
+    """
+    Serializes a document built by get_swagger_doc
+    :param swagger_doc: The swagger document
+    :return: The json bytes and their strong ETag
+    """
+    data = (json.dumps(swagger_doc) + "\n").encode()
+    return data, hashlib.sha256(data).hexdigest()
+
+
+def export_swagger_doc(swagger_object, fingerprints=None):
+    """
+    Serializes the whole document, without filtering by `auth`, in a deterministic order: the keys are sorted
+    :param swagger_object: The swagger document
+    :param fingerprints: Optional fingerprints of an Api, see Api.fingerprints, written in "x-fingerprints"
+    so that the document can be loaded back with Api(spec_snapshot=...)
+    :return: The json bytes and their sha256 hex digest
+    """
+    # the keys which aren't strings, e.g. the response codes, are converted as when the document is served
+    swagger_doc = json.loads(json.dumps(get_swagger_doc(swagger_object, check_auth=False)))
+    if fingerprints:
+        swagger_doc["x-fingerprints"] = dict(fingerprints)
+    data = (json.dumps(swagger_doc, indent=2, sort_keys=True) + "\n").encode()
+    return data, hashlib.sha256(data).hexdigest()
+
+
+def _iter_json(value, depth):
+    if depth == 0 or not isinstance(value, dict) or not value:
+        yield json.dumps(value)
+        return
+
+    yield '{'
+    for i, (k, v) in enumerate(value.items()):
+        yield '{}{}: '.format(', ' if i else '', json.dumps(k))
+        yield from _iter_json(v, depth - 1)
+    yield '}'
+
+
+def stream_swagger_doc(swagger_doc):
+    """
+    Serializes a document built by get_swagger_doc piece by piece.
+    The small fields come first, then the paths, then the components,
+    so that a single path or component is serialized at a time.
+    :param swagger_doc: The swagger document
+    :return: A generator of json bytes chunks
+    """
+    keys = [k for k in swagger_doc if k not in STREAM_DEPTHS] + [k for k in STREAM_DEPTHS if k in swagger_doc]
+
+    def pieces():
+        yield '{'
+        for i, k in enumerate(keys):
+            yield '{}{}: '.format(', ' if i else '', json.dumps(k))
+            yield from _iter_json(swagger_doc[k], STREAM_DEPTHS.get(k, 0))
+        yield '}\n'
+
+    chunk = []
+    size = 0
+    for piece in pieces():
+        chunk.append(piece)
+        size += len(piece)
+        if size >= STREAM_CHUNK_SIZE:
+            yield ''.join(chunk).encode()
+            chunk = []
+            size = 0
+    if chunk:
+        yield ''.join(chunk).encode()
+
+
+def digest_swagger_doc(swagger_doc):
+    """
+    Computes the strong ETag of a streamed document without keeping it in memory
+    :param swagger_doc: The swagger document
+    :return: None in place of the json bytes, and the ETag
+    """
+    digest = hashlib.sha256()
+    for chunk in stream_swagger_doc(swagger_doc):
+        digest.update(chunk)
+    return None, digest.hexdigest()
+
+
+def create_open_api_resource(swagger_object, generation=None, cache_control=None,
+                             auth_cache_size=None, auth_cache_ttl=60, stream=False):
+    """
+    Creates a flask_restful api endpoint for the swagger spec
+    :param swagger_object: The swagger document
+    :param generation: Optional callable returning a counter which changes each time swagger_object is updated.
+    It is called before swagger_object is read, so that its owner can bring it up to date.
+    When given, the document is compiled once per generation and per auth-filter result,
+    and served as pre-serialized json.
+    :param cache_control: Optional Cache-Control header of the responses
+    :param auth_cache_size: When given with generation, the operations allowed for an api_key are kept
+    for auth_cache_ttl seconds, and `auth` isn't called for the next requests with that api_key.
+    At most auth_cache_size api_keys are kept, the least recently used are evicted first.
+    :param auth_cache_ttl: Number of seconds an api_key is kept
+    :param stream: Serialize the document while it is sent instead of keeping it serialized in memory.
+    Only its ETag is kept.
+    :return: The resource class
+    """
+    compiled = {'key': None, 'docs': collections.OrderedDict(), 'principals': collections.OrderedDict(),
+                'index': None, 'fragments': collections.OrderedDict()}
+    lock = Lock()
+    serialize = digest_swagger_doc if stream else serialize_swagger_doc
+
+    def update(current_generation):
+        # must be called with the lock held
+        key = (current_generation, auth, auth_many)
+        if compiled['key'] != key:
+            compiled['docs'].clear()
+            compiled['principals'].clear()
+            compiled['index'] = None
+            compiled['fragments'].clear()
+            compiled['key'] = key
+
+    def compile_spec(current_generation, operations, schemas):
+        with lock:
+            update(current_generation)
+            docs = compiled['docs']
+            if (operations, schemas) not in docs:
+                swagger_doc = get_swagger_doc(swagger_object, check_auth=False, operations=operations, schemas=schemas)
+                docs[(operations, schemas)] = serialize(swagger_doc)
+                if len(docs) > MAX_COMPILED_DOCS:
+                    docs.popitem(last=False)
+            return docs[(operations, schemas)]
+
+    def serialize_fragment(operations, schemas, pointer):
+        # only the serialized fragments are kept, the pointers are resolved in swagger_object
+        try:
+            return serialize_swagger_doc(resolve_swagger_pointer(swagger_object, pointer, operations, schemas))
+        except KeyError:
+            return None
+
+    def compile_fragment(current_generation, operations, schemas, pointer):
+        if current_generation is None:
+            return serialize_fragment(operations, schemas, pointer)
+
+        with lock:
+            update(current_generation)
+            fragments = compiled['fragments']
+            key = (operations, schemas, pointer)
+            if key not in fragments:
+                fragments[key] = serialize_fragment(operations, schemas, pointer)
+                if len(fragments) > MAX_COMPILED_FRAGMENTS:
+                    fragments.popitem(last=False)
+            return fragments[key]
+
+    def get_index(current_generation):
+        if current_generation is None:
+            return get_spec_index(swagger_object)
+        with lock:
+            update(current_generation)
+            if compiled['index'] is None:
+                compiled['index'] = get_spec_index(swagger_object)
+            return compiled['index']
+
+    def get_principal_operations(current_generation, api_key):
+        with lock:
+            update(current_generation)
+            principals = compiled['principals']
+            cached = principals.get(api_key)
+            if cached is not None and cached[0] > monotonic():
+                principals.move_to_end(api_key)
+                return cached[1]
+
+        # auth may be slow, it is called without the lock
+        operations = get_allowed_operations(swagger_object, api_key)
+
+        with lock:
+            if compiled['key'] == (current_generation, auth, auth_many):
+                principals = compiled['principals']
+                principals[api_key] = (monotonic() + auth_cache_ttl, operations)
+                principals.move_to_end(api_key)
+                if len(principals) > auth_cache_size:
+                    principals.popitem(last=False)
+        return operations
 
     class SwaggerEndpoint(Resource):
-        def get(self):
-            swagger_doc = {}
-            # filter keys with empty values
-
-            for k, v in swagger_object.items():
-                if v or k == 'paths':
-                    if k == 'paths':
-                        paths = {}
-                        for endpoint, view in v.items():
-                            views = {}
-                            for method, docs in view.items():
-                                # check permissions. If a user has not access to an api, do not show the docs of it
-                                if auth(request.args.get('api_key'), endpoint, method):
-                                    views[method] = docs
-                            if views:
-                                paths[endpoint] = views
-                        swagger_doc['paths'] = collections.OrderedDict(sorted(paths.items()))
-                    else:
-                        swagger_doc[k] = v
-
-                if k == 'servers':
-                    validate_servers_object(v)
-
-                if k == 'info':
-                    validate_info_object(v)
-                    continue
-
-            return swagger_doc
+        def get(self, tag=None, pointer=None):
+            current_generation = generation() if generation is not None else None
+
+            operations = None
+            if is_auth_overridden():
+                api_key = request.args.get('api_key')
+                if current_generation is not None and auth_cache_size:
+                    operations = get_principal_operations(current_generation, api_key)
+                else:
+                    operations = get_allowed_operations(swagger_object, api_key)
+
+            # the shard of some tags: their operations and the schemas they need
+            schemas = None
+            tags = [name.strip() for name in request.args.get('tags', '').split(',') if name.strip()]
+            if tag is not None:
+                tags.append(tag)
+            if tags:
+                index = get_index(current_generation)
+                if tag is not None and tag not in index['tags']:
+                    abort(404)
+                operations, schemas = get_shard(index, tags, operations)
+
+            # a fragment of the document, e.g. swagger.json/components/schemas/UserModel
+            if pointer is not None:
+                pointer = '/' + pointer
+            else:
+                pointer = request.args.get('pointer')
+            if pointer is not None:
+                if pointer and not pointer.startswith('/'):
+                    abort(400, message=f'Invalid JSON pointer "{pointer}", it must start with a "/"')
+                fragment = compile_fragment(current_generation, operations, schemas, pointer)
+                if fragment is None:
+                    abort(404)
+                data, etag = fragment
+            elif current_generation is None:
+                data, etag = serialize(get_swagger_doc(swagger_object, check_auth=False, operations=operations,
+                                                       schemas=schemas))
+            else:
+                data, etag = compile_spec(current_generation, operations, schemas)
+
+            if stream and pointer is None:
+                if request.if_none_match.contains(etag):
+                    data = b''
+                else:
+                    data = stream_swagger_doc(get_swagger_doc(swagger_object, check_auth=False, operations=operations,
+                                                              schemas=schemas))
+
+            response = current_app.response_class(data, mimetype='application/json')
+            response.set_etag(etag)
+            if cache_control:
+                response.headers['Cache-Control'] = cache_control
+            return response.make_conditional(request)
 
     return SwaggerEndpoint
 
@@ -114,6 +558,8 @@ def get_data_type(param):
     :param param: swagger parameter
     :return: Python type
     """
+    from flask_restful import inputs
+
     if not param:
         return None
     try:
@@ -247,6 +693,9 @@ def get_parser_arg(param):
     :return: Request parser argument
     """
     if 'schema' in param:
+        if inspect.isclass(param['schema']):
+            # Schema not yet replaced by its reference by Api.add_resource
+            param = dict(param, schema={'$ref': param['schema']})
         if '$ref' in param['schema']:
             list_obj = [(name, sec) for name, sec in get_parser_from_schema(param)]
             return list_obj
@@ -291,6 +740,8 @@ def get_parser(params):
     :param params: swagger doc parameters
     :return: Query parameter parser
     """
+    from flask_restful import reqparse
+
     parser = reqparse.RequestParser()
 
     for arg in get_parser_args(params):
@@ -303,708 +754,187 @@ def get_parser(params):
     return parser
 
 
-def validate_open_api_object(open_api_object):
-    if "securitySchemes" in open_api_object["components"]:
-        components_security_schemes = open_api_object["components"]["securitySchemes"]
-    else:
-        components_security_schemes = None
-    for k, v in open_api_object.items():
-        if k not in constants.open_api_object_list:
-            raise ValidationError('Invalid open api object. Unknown field "{field}". See {url}'.format(
-                field=k,
-                url='https://swagger.io/specification/#OpenAPIObject'))
-
-        if k == 'openapi':
-            if type(v) is not str:
-                raise ValidationError('Invalid open api object. "{0}" must be a str but was {1}'.format(k, type(v)))
-
-        if k == 'info':
-            validate_info_object(v)
-            continue
-
-        if k == 'servers':
-            validate_servers_object(v)
-            continue
-
-        if k == 'paths':
-            validate_paths_object(v, components_security_schemes)
-            continue
-
-        if k == 'components':
-            validate_components_object(v)
-            continue
-
-        if k == 'security':
-            validate_security(v, components_security_schemes)
-
-        if k == 'tags':
-            validate_tags(v)
+def _validate(kind, obj, components_security_schemes=None):
+    # the validation tables are built on the first validation
+    from flask_restful_swagger_3 import validator
 
-        if k == 'externalDocs':
-            validate_external_documentation_object(v)
+    errors = validator.get_errors(obj, kind, components_security_schemes)
+    if errors:
+        raise ValidationError(errors[0]['message'], errors)
 
-    if 'openapi' not in open_api_object:
-        raise ValidationError('Invalid open api object. Missing field "openapi"')
 
-    if 'info' not in open_api_object:
-        raise ValidationError('Invalid open api object. Missing field "info"')
-
-    if 'paths' not in open_api_object:
-        raise ValidationError('Invalid open api object. Missing field "paths"')
+def validate_open_api_object(open_api_object):
+    """
+    Checks the whole document. The raised ValidationError holds all the errors of the document in `errors`.
+    """
+    _validate('open_api', open_api_object)
 
 
 def validate_info_object(info_object):
-    for k, v in info_object.items():
-        if k not in constants.info_object_list:
-            raise ValidationError('Invalid info object. Unknown field "{field}". See {url}'.format(
-                field=k,
-                url='https://swagger.io/specification/#infoObject'))
-
-        if k == 'contact':
-            validate_contact_object(v)
-            continue
-
-        if k == 'license':
-            validate_license_object(v)
-            continue
-
-    if 'title' not in info_object:
-        raise ValidationError('Invalid info object. Missing field "title"')
-
-    if 'version' not in info_object:
-        raise ValidationError('Invalid info object. Missing field "version"')
+    _validate('info', info_object)
 
 
 def validate_contact_object(contact_object):
-    if contact_object:
-        for k, v in contact_object.items():
-            if k not in constants.contact_object_list:
-                raise ValidationError('Invalid contact object. Unknown field "{field}". See {url}'.format(
-                    field=k,
-                    url='https://swagger.io/specification/#contactObject'))
-
-            if k == 'email':
-                if not validate_email(v):
-                    raise ValidationError('Invalid email. See {url}'.format(
-                        url='https://swagger.io/specification/#contactObject'))
+    _validate('contact', contact_object)
 
 
 def validate_license_object(license_object):
-    if license_object:
-        for k, v in license_object.items():
-            if k not in constants.license_object_list:
-                raise ValidationError('Invalid license object. Unknown field "{field}". See {url}'.format(
-                    field=k,
-                    url='https://swagger.io/specification/#licenseObject'))
-
-            if k == 'url':
-                if not validate_url(v):
-                    raise ValidationError('Invalid url. See {url}'.format(
-                        url='https://swagger.io/specification/#licenseObject'))
-
-        if 'name' not in license_object:
-            raise ValidationError('Invalid license object. Missing field "name"')
+    _validate('license', license_object)
 
 
 def validate_callback_object(call_back_object, components_security_schemes):
-    for k, v in call_back_object.items():
-        validate_path_item_object(v, components_security_schemes)
+    _validate('callback', call_back_object, components_security_schemes)
 
 
 def validate_paths_object(paths_object, components_security_schemes):
-    for k, v in paths_object.items():
-        if type(k) is not str:
-            raise ValidationError(f'Invalid paths object. "{k}" must be a str but was "{type(v)}"')
-        if not k.startswith('/'):
-            raise ValidationError(f'Invalid paths object. "{k}" must start with a leading slash')
-        if k.endswith('/'):
-            raise ValidationError(f'Invalid paths object. "{k}" must not have an ending slash')
-        validate_path_item_object(v, components_security_schemes)
+    _validate('paths', paths_object, components_security_schemes)
 
 
 def validate_path_item_object(path_item_object, components_security_schemes):
     """Checks if the passed object is valid according to https://swagger.io/specification/#pathItemObject"""
-    for k, v in path_item_object.items():
-        if k == '$ref':
-            continue
-        if k in constants.operation_object_list:
-            validate_operation_object(v, components_security_schemes)
-            continue
-        if k == 'servers':
-            validate_servers_object(v)
-            continue
-        if k == 'parameters':
-            for parameter in v:
-                try:
-                    validate_reference_object(parameter)
-                except ValidationError:
-                    validate_parameter_object(parameter)
-            continue
-        if k == "summary":
-            continue
-        if k == "description":
-            continue
-        raise ValidationError('Invalid path item object. Unknown field "{field}". See {url}'.format(
-            field=k,
-            url='https://swagger.io/specification/#pathItemObject'))
+    _validate('path_item', path_item_object, components_security_schemes)
 
 
 def validate_operation_object(operation_object, components_security_schemes):
-    for k, v in operation_object.items():
-        if k in ['tags']:
-            if isinstance(v, list):
-                continue
-            raise ValidationError('Invalid operation object. "{0}" must be a list but was "{1}"', k, type(v))
-        if k in ['summary', 'description', 'operationId']:
-            if isinstance(v, str):
-                continue
-            raise ValidationError('Invalid operation object. "{0}" must be a string but was "{1}"', k, type(v))
-        if k in ['requestBody']:
-            validate_request_body_object(v)
-            continue
-        if k in ['deprecated']:
-            if isinstance(v, bool):
-                continue
-            raise ValidationError('Invalid operation object. "{0}" must be a bool but was "{1}"', k, type(v))
-        if k in ['externalDocs']:
-            validate_external_documentation_object(v)  # to check
-            continue
-        if k in ['parameters']:
-            for parameter in v:
-                validate_parameter_object(parameter)
-            continue
-        if k in ['responses']:
-            validate_responses_object(v)
-            continue
-        if k in ['security']:
-            validate_security(v, components_security_schemes)
-            continue
-        if k in ['callbacks']:
-            validate_callback_object(v, components_security_schemes)
-            continue
-        raise ValidationError('Invalid operation object. Unknown field "{field}". See {url}'.format(
-            field=k,
-            url='https://swagger.io/specification/#operationObject'))
-    if 'responses' not in operation_object:
-        raise ValidationError('Invalid operation object. Missing field "responses"')
+    _validate('operation', operation_object, components_security_schemes)
 
 
 def validate_map_parameter_object(map_parameter_object):
-    for k, v in map_parameter_object.items():
-        try:
-            validate_parameter_object(v)
-        except ValidationError:
-            validate_reference_object(v)
+    _validate('map_parameter', map_parameter_object)
 
 
 def validate_parameter_object(parameter_object):
-    for k, v in parameter_object.items():
-        if k not in constants.parameter_object_list:
-            raise ValidationError('Invalid parameter object. Unknown field "{field}". See {url}'.format(
-                field=k,
-                url='https://swagger.io/specification/#parameterObject'))
-    if 'name' not in parameter_object:
-        raise ValidationError('Invalid parameter object. Missing field "name"')
-    if 'in' not in parameter_object:
-        raise ValidationError('Invalid parameter object. Missing field "in"')
-    else:
-        if parameter_object['in'] not in ['path', 'query', 'header', 'cookie']:
-            raise ValidationError(
-                'Invalid parameter object. Value of field "in" must be path, query, header, cookie was "{0}"'.format(
-                    parameter_object['in']))
-    if 'schema' in parameter_object:
-        validate_schema_object(parameter_object['schema'])
+    _validate('parameter', parameter_object)
 
 
 def validate_reference_object(reference_object):
-    if len(reference_object.keys()) > 1 or '$ref' not in reference_object:
-        raise ValidationError('Invalid reference object. It may only contain key "$ref"')
+    _validate('reference', reference_object)
 
 
 def validate_external_documentation_object(external_documentation_object):
-    for k, v in external_documentation_object.items():
-        if k not in constants.external_doc_object_list:
-            raise ValidationError('Invalid external documentation object. Unknown field "{field}". See {url}'.format(
-                field=k,
-                url='https://swagger.io/specification/#externalDocumentationObject'))
-
-        if k == 'description':
-            if not type(v) == str:
-                raise ValidationError('Invalid external documentation object.'
-                                      ' "{0}" must be a str but was {1}'.format(k, type(v)))
-
-        if k == 'url':
-            validate_url(v)
-
-    if 'url' not in external_documentation_object:
-        raise ValidationError('Invalid external documentation object. Missing field "url"')
+    _validate('external_documentation', external_documentation_object)
 
 
 def validate_map_responses_object(map_responses_object):
-    for k, v in map_responses_object.items():
-        try:
-            validate_reference_object(v)
-        except ValidationError:
-            validate_responses_object(v)
+    _validate('map_responses', map_responses_object)
 
 
 def validate_responses_object(responses_object):
-    for k, v in responses_object.items():
-        if type(k) not in [int, str, HTTPStatus]:
-            raise ValidationError(f'Invalid responses object. '
-                                  f'"{k}" must be a "int" (HttpStatusCode), a "HTTPStatus enum" or a "str" (default), '
-                                  f'but was {type(k)}')
-        try:
-            k = int(k)
-        except ValueError:
-            pass
-
-        if k not in constants.responses_object_list and k != 'default':
-            raise ValidationError(f'Invalid responses object. it must be a HttpStatusCode, a HTTPStatus enum '
-                                  f'or "default" but was {k}')
-        try:
-            validate_response_object(v)
-        except ValidationError:
-            validate_reference_object(v)
+    _validate('responses', responses_object)
 
 
 def validate_response_object(response_object):
-    for k, v in response_object.items():
-        if k == 'description':
-            continue
-        if k == 'headers':
-            try:
-                validate_reference_object(v)
-                continue
-            except ValidationError:
-                validate_map_header_object(v)
-                continue
-        if k == 'content':
-            validate_map_media_type_object(v)
-            continue
-        if k == "links":
-            validate_link_object(v)
-            continue
-        raise ValidationError('Invalid response object. Unknown field "{field}". See {url}'.format(
-            field=k,
-            url='https://swagger.io/specification/#responseObject'))
-    if 'description' not in response_object:
-        raise ValidationError('Invalid response object. Missing field "description"')
+    _validate('response', response_object)
 
 
 def validate_map_request_body_object(map_request_body_object):
-    for k, v in map_request_body_object.items():
-        try:
-            validate_request_body_object(v)
-        except ValidationError:
-            validate_reference_object(v)
+    _validate('map_request_body', map_request_body_object)
 
 
 def validate_request_body_object(request_body_object):
-    for k, v in request_body_object.items():
-        if k in ['description']:
-            continue
-        if k in ['required']:
-            if isinstance(v, bool):
-                continue
-        if k in ['content']:
-            validate_map_media_type_object(v)
-            continue
-
-    if 'content' not in request_body_object:
-        raise ValidationError('Invalid request body object. Missing field "content"')
+    _validate('request_body', request_body_object)
 
 
 def validate_map_media_type_object(map_media_type_object):
-    for k, v in map_media_type_object.items():
-        if validate_media_type(k):
-            validate_media_type_object(v)
-            continue
-        raise ValidationError(
-            'Invalid content object, the field must match the following pattern ("application/json", "*/*" ...").'
-            '. See https://swagger.io/specification/#mediaTypeObject'
-        )
+    _validate('map_media_type', map_media_type_object)
 
 
 def validate_media_type_object(media_type_object):
-    for k, v in media_type_object.items():
-        if k == "schema":
-            validate_schema_object(v)
-            continue
-        if k == "example":
-            continue
-
-        if k == "examples":
-            validate_map_example_object(v)
-            continue
+    _validate('media_type', media_type_object)
 
 
 def validate_security(securities, components_security_schemes):
-    if type(securities) is not list:
-        raise ValidationError(f'Invalid operation object. "security" must be a list but was {type(securities)}')
-    for security in securities:
-        validate_security_requirement_object(security, components_security_schemes)
+    _validate('security', securities, components_security_schemes)
 
 
 def validate_security_requirement_object(security_requirement_object, components_security_schemes):
-    if not components_security_schemes:
-        raise ValidationError("Each property of security requirement object must correspond "
-                              "to a security scheme declared in the Security Schemes under the Components Object, "
-                              "but the Security Schemes is not declared. "
-                              "See https://swagger.io/specification/#SecurityRequirementObject")
-    for k, v in security_requirement_object.items():
-        if type(v) is not list:
-            raise ValidationError(f'Invalid security requirement object. '
-                                  f'"{k}" must be a list, but was {type(v)}')
-        if k not in components_security_schemes:
-            raise ValidationError("Each property of security requirement object must correspond "
-                                  "to a security scheme declared in the Security Schemes under the Components Object, "
-                                  "See https://swagger.io/specification/#SecurityRequirementObject")
-        _type = components_security_schemes[k].get('type', None)
-        if _type not in ['oauth2', 'openIdConnect'] and len(v) > 0:
-            raise ValidationError(f'Invalid security requirement object. '
-                                  f'"{k}" must be empty except for "oauth2", "openIdConnect"')
+    _validate('security_requirement', security_requirement_object, components_security_schemes)
 
 
 def validate_map_security_scheme_object(map_security_scheme_object):
-    for k, v in map_security_scheme_object.items():
-        try:
-            validate_security_scheme_object(v)
-        except ValidationError:
-            validate_reference_object(v)
+    _validate('map_security_scheme', map_security_scheme_object)
 
 
 def validate_security_scheme_object(security_scheme_object):
-    for k, v in security_scheme_object.items():
-        if k not in constants.security_scheme_list:
-            raise ValidationError('Invalid security scheme object. Unknown field "{field}". See {url}'.format(
-                field=k,
-                url='https://swagger.io/specification/#SecuritySchemeObject'))
-
-    if 'type' not in security_scheme_object:
-        raise ValidationError('Invalid security scheme object. Missing field "type"')
-    _type = security_scheme_object['type']
-    if _type not in constants.security_scheme_object_type_list:
-        raise ValidationError(f'"type" must be one of {", ".join(constants.security_scheme_object_type_list)}')
-    if _type == 'apiKey':
-        if 'name' not in security_scheme_object:
-            raise ValidationError('Invalid security scheme object. Missing field "name" when type is "apiKey"')
-        if 'in' not in security_scheme_object:
-            raise ValidationError('Invalid security scheme object. Missing field "in" when type is "apiKey"')
-    if _type == 'http':
-        if 'scheme' not in security_scheme_object:
-            raise ValidationError('Invalid security scheme object. Missing field "scheme" when type is "http"')
-        scheme = security_scheme_object['scheme']
-        if scheme not in constants.security_scheme_object_scheme_list:
-            raise ValidationError(
-                f'Invalid security scheme object. '
-                f'"scheme" must be one of {", ".join(constants.security_scheme_object_scheme_list)} ')
-    if _type == 'oauth2':
-        if 'flows' not in security_scheme_object:
-            raise ValidationError('Invalid security scheme object. Missing field "flows" when type is "oauth2"')
-        validate_oauth_flows_object(security_scheme_object['flows'])
-    if _type == 'openIdConnect':
-        if 'openIdConnectUrl' not in security_scheme_object:
-            raise ValidationError('Invalid security scheme object. Missing field '
-                                  '"openIdConnectUrl" when type is openIdConnectUrl')
-        if not validate_url(security_scheme_object['openIdConnectUrl']):
-            raise ValidationError('Invalid url. See {url}'.format(
-                url='https://swagger.io/specification/#securitySchemeObject'))
+    _validate('security_scheme', security_scheme_object)
 
 
 def validate_oauth_flows_object(oauth_flows_object):
-    for k, v in oauth_flows_object.items():
-        if k not in constants.oauth_flows_object_list:
-            raise ValidationError('Invalid oauth flows object. Unknown field "{field}". See {url}'.format(
-                field=k,
-                url='https://swagger.io/specification/#OAuthFlowsObject'))
-
-    if 'implicit' in oauth_flows_object:
-        _validate_oauth_flows_object('implicit', oauth_flows_object['implicit'])
-
-    if 'password' in oauth_flows_object:
-        _validate_oauth_flows_object('password', oauth_flows_object['password'])
-
-    if 'clientCredentials' in oauth_flows_object:
-        _validate_oauth_flows_object('clientCredentials', oauth_flows_object['clientCredentials'])
-
-    if 'authorizationCode' in oauth_flows_object:
-        _validate_oauth_flows_object('authorizationCode', oauth_flows_object['authorizationCode'])
-
-
-def _validate_oauth_flows_object(key, oauth_flows_object):
-    for k, v in oauth_flows_object.items():
-        if k not in constants.oauth_flows_object_sub_level_list:
-            raise ValidationError('Invalid oauth flows object. Unknown field "{field}". See {url}'.format(
-                field=k,
-                url='https://swagger.io/specification/#OAuthFlowsObject'))
-
-    if 'refreshUrl' in oauth_flows_object:
-        if not validate_url(oauth_flows_object['refreshUrl']):
-            raise ValidationError('Invalid url. See {url}'.format(
-                url='https://swagger.io/specification/#OAuthFlowsObject'))
-
-    if 'scopes' not in oauth_flows_object:
-        raise ValidationError('Invalid oauth flows object. Missing field "scopes"')
-    try:
-        for k, v in oauth_flows_object['scopes'].items():
-            if not type(v) is str:
-                raise ValidationError('Invalid oauth flows object. "scopes" must be a dict of string')
-    except AttributeError:
-        raise ValidationError('Invalid oauth flows object. "scopes" must be a dict of string')
-    if key == 'implicit' or key == 'authorizationCode':
-        check_authorization_url(oauth_flows_object)
-
-    if key == 'authorizationCode' or key == 'password' or key == 'clientCredentials':
-        check_token_url(oauth_flows_object)
-
-
-def check_authorization_url(oauth_flows_object):
-    if 'authorizationUrl' not in oauth_flows_object:
-        raise ValidationError('Invalid oauth flows object. Missing field "authorizationUrl"')
-    if not validate_url(oauth_flows_object['authorizationUrl']):
-        raise ValidationError('Invalid url. See {url}'.format(
-            url='https://swagger.io/specification/#OAuthFlowsObject'))
-
-
-def check_token_url(oauth_flows_object):
-    if 'tokenUrl' not in oauth_flows_object:
-        raise ValidationError('Invalid oauth flows object. Missing field "tokenUrl"')
-    if not validate_url(oauth_flows_object['tokenUrl']):
-        raise ValidationError('Invalid url. See {url}'.format(
-            url='https://swagger.io/specification/#OAuthFlowsObject'))
+    _validate('oauth_flows', oauth_flows_object)
 
 
 def validate_components_object(components_object):
-    for k, v in components_object.items():
-        if k not in constants.components_object_list:
-            raise ValidationError('Invalid components object. Unknown field "{field}". See {url}'.format(
-                field=k,
-                url='https://swagger.io/specification/#ComponentsObject'))
-        if k == "schemas":
-            validate_map_schema_object(v)
-            continue
-
-        if k == "responses":
-            validate_map_responses_object(v)
-            continue
-
-        if k == "parameters":
-            validate_map_parameter_object(v)
-            continue
-
-        if k == "examples":
-            validate_map_example_object(v)
-            continue
-
-        if k == "requestBodies":
-            validate_map_request_body_object(v)
-            continue
-
-        if k == "headers":
-            validate_map_header_object(v)
-            continue
-
-        if k == "securitySchemes":
-            validate_map_security_scheme_object(v)
-            continue
-
-        if k == 'links':
-            validate_map_link_object(v)
-            continue
-
-        if k == 'callbacks':
-            if "securitySchemes" in components_object:
-                validate_callback_object(v, components_object["securitySchemes"])
-            else:
-                validate_callback_object(v, None)
+    _validate('components', components_object)
 
 
 def validate_map_schema_object(map_schema_object):
-    for k, v in map_schema_object.items():
-        if 'properties' in v:
-            continue
-        validate_schema_object(v)
+    _validate('map_schema', map_schema_object)
 
 
 def validate_schema_object(schema_object):
-    for k, v in schema_object.items():
-        try:
-            validate_reference_object(v)
-        except AttributeError:
-            if k == 'required' and not isinstance(v, list):
-                raise ValidationError('Invalid schema object. "{0}" must be a list but was {1}'.format(k, type(v)))
+    _validate('schema', schema_object)
 
 
 def validate_map_header_object(map_header_object):
-    for k, v in map_header_object.items():
-        try:
-            validate_header_object(v)
-        except ValidationError:
-            validate_reference_object(v)
+    _validate('map_header', map_header_object)
 
 
 def validate_header_object(header_object):
-    for k, v in header_object.items():
-        if k not in constants.headers_object_list:
-            raise ValidationError('Invalid header object. Unknown field "{field}". See {url}'.format(
-                field=k,
-                url='https://swagger.io/specification/#HeaderObject'))
-        if k == 'name':
-            raise ValidationError('"name" must not be specified. See https://swagger.io/specification/#HeaderObject')
-        if k == 'in':
-            raise ValidationError('"in" must not be specified. See https://swagger.io/specification/#HeaderObject')
-
-        if k == 'schema':
-            validate_schema_object(header_object['schema'])
-            continue
+    _validate('header', header_object)
 
 
 def validate_map_link_object(map_link_object):
-    for k, v in map_link_object.items():
-        try:
-            validate_link_object(v)
-        except ValidationError:
-            validate_reference_object(v)
+    _validate('map_link', map_link_object)
 
 
 def validate_link_object(link_object):
-    for k, v in link_object.items():
-        if k not in constants.link_object_list:
-            raise ValidationError('Invalid link object. Unknown field "{field}". See {url}'.format(
-                field=k,
-                url='https://swagger.io/specification/#linkObject'))
-
-        if k == 'operationRef' and type(v) is not str:
-            raise ValidationError('Invalid link object. "{0}" must be a str but was {1}'.format(k, type(v)))
-
-        if k == 'operationId' and type(v) is not str:
-            raise ValidationError('Invalid link object. "{0}" must be a str but was {1}'.format(k, type(v)))
-
-        if k == 'description' and type(v) is not str:
-            raise ValidationError('Invalid link object. "{0}" must be a str but was {1}'.format(k, type(v)))
-
-        if k == 'server':
-            validate_server_object(v)
+    _validate('link', link_object)
 
 
 def validate_servers_object(servers_object):
-    if type(servers_object) is not list:
-        raise ValidationError('Invalid server object. servers must be a list but was {0}'.format(type(servers_object)))
-    for server_object in servers_object:
-        validate_server_object(server_object)
+    _validate('servers', servers_object)
 
 
 def validate_server_object(server_object):
-    if isinstance(server_object, dict):
-        for k, v in server_object.items():
-            if k not in constants.server_object_list:
-                raise ValidationError('Invalid server object. Unknown field "{field}". See {url}'.format(
-                    field=k,
-                    url='https://swagger.io/specification/#ServerObject'))
-
-            if k == 'variables':
-                validate_server_variables_object(v)
-                continue
-
-            if k == 'url':
-                if not validate_url(v):
-                    raise ValidationError('Invalid url. See {url}'.format(
-                        url='https://swagger.io/specification/#ServerObject'))
-
-        if "url" not in server_object:
-            raise ValidationError('Invalid server object. Missing field "url"')
-    else:
-        raise ValidationError('Invalid server object. See {url}'.format(
-            url='https://swagger.io/specification/#ServerObject'
-        ))
+    _validate('server', server_object)
 
 
 def validate_server_variables_object(server_variables_object):
-    for k, v in server_variables_object.items():
-        if k not in constants.server_variables_object_list:
-            raise ValidationError('Invalid server variables object. Unknown field "{field}". See {url}'.format(
-                field=k,
-                url='https://swagger.io/specification/#ServerVariablesObject'))
-
-        if k == 'enum':
-            if isinstance(v, list):
-                if not all(isinstance(x, str) for x in v):
-                    raise ValidationError(
-                        'Invalid server variables object object. Each item of enum must be string'
-                        'See https://swagger.io/specification/#ServerVariablesObject'
-                    )
-            else:
-                raise ValidationError(
-                    'Invalid server variables object object. Enum must be a list of strings'
-                    'See https://swagger.io/specification/#ServerVariablesObject'
-                )
-
-    if 'default' not in server_variables_object:
-        raise ValidationError(
-            'Invalid server variables object object. Missing field "url"'
-            'See https://swagger.io/specification/#ServerVariablesObject'
-        )
+    _validate('server_variables', server_variables_object)
 
 
 def validate_map_example_object(map_example_object):
-    for k, v in map_example_object.items():
-        try:
-            validate_reference_object(v)
-        except ValidationError:
-            validate_example_object(v)
+    _validate('map_example', map_example_object)
 
 
 def validate_example_object(example_object):
-    for k, v in example_object.items():
-        if k not in constants.example_object_list:
-            raise ValidationError('Invalid example object. Unknown field "{field}". See {url}'.format(
-                field=k,
-                url='https://swagger.io/specification/#ExampleObject'))
-
-        if k == 'value':
-            continue
-
-        if k == 'summary' or k == 'description' or k == 'externalValue':
-            if not type(v) == str:
-                raise ValidationError('Invalid example object. "{0}" must be a str but was {1}'.format(k, type(v)))
+    _validate('example', example_object)
 
 
 def validate_tags(tag_list):
-    if type(tag_list) is not list:
-        raise ValidationError(f'Invalid tags object. "tags" must be a list but was {type(tag_list)}')
-    for tag in tag_list:
-        validate_tag_object(tag)
+    _validate('tags', tag_list)
 
 
 def validate_tag_object(tag_object):
-    for k, v in tag_object.items():
-        if k not in constants.tag_object_list:
-            raise ValidationError('Invalid tag object. Unknown field "{field}". See {url}'.format(
-                field=k,
-                url='https://swagger.io/specification/#TagObject'))
-
-        if k == 'name' or k == 'description':
-            if not type(v) == str:
-                raise ValidationError('Invalid tag object. "{0}" must be a str but was {1}'.format(k, type(v)))
-
-        if k == 'externalDocs':
-            validate_external_documentation_object(v)
-
-    if 'name' not in tag_object:
-        raise ValidationError('Invalid tag object. Missing field "name"')
+    _validate('tag', tag_object)
 
 
 def validate_url(url):
-    return re.match(constants.Regex.url, url) is not None
+    from flask_restful_swagger_3 import validator
+
+    return validator.is_url(url)
 
 
 def validate_email(email):
-    return re.match(constants.Regex.email, email) is not None
+    from flask_restful_swagger_3 import validator
+
+    return validator.is_email(email)
 
 
 def validate_media_type(media_type):
-    return re.match(constants.Regex.media_type, media_type) is not None
+    from flask_restful_swagger_3 import validator
+
+    return validator.is_media_type(media_type)
 
 
 def extract_swagger_path(path):
@@ -1017,6 +947,15 @@ def extract_swagger_path(path):
     return re.sub(constants.Regex.path, "{\\1}", path), re.findall("<(.*?)>", path)
 
 
+@lru_cache(maxsize=1024)
+def extract_rule_swagger_path(rule):
+    """
+    Same as extract_swagger_path, cached for the url rules of the requests checked by `auth`.
+    The result is shared, it must not be modified.
+    """
+    return extract_swagger_path(rule)
+
+
 def sanitize_doc(comment):
     """
     Substitute HTML breaks for new lines in comment text.
@@ -1029,19 +968,100 @@ def sanitize_doc(comment):
         return comment.replace('\n', '<br/>') if comment else comment
 
 
-def expected(schema, required=False):
+_BODY_VALIDATORS = {}
+
+
+def _array_body_validator(items):
+    if not (_is_schema(items) and items.properties):
+        return None
+
+    def validate_array(body):
+        if not isinstance(body, list):
+            return [{'field': None, 'message': 'The request body must be a list'}]
+        errors = [{'index': i, 'field': None, 'message': 'The item must be an object'}
+                  for i, item in enumerate(body) if not isinstance(item, dict)]
+        return errors or [{'index': error['row'], 'field': error['field'], 'message': error['message']}
+                          for error in items.validate_many(body)[1]]
+
+    return validate_array
+
+
+def get_body_validator(schema):
+    """
+    Returns the function validating a request body with a schema, compiled once per schema.
+    The bodies are validated as instantiating the schema would, by Schema.validate_many.
+    :param schema: A Schema class with properties, an array of such schemas, or a list of one such schema
+    :return: The function returning the list of the errors of a body, as dicts with the "field" (and the "index" of
+    the item for an array) and the "message"; None when the schema has nothing to validate
+    """
+    if isinstance(schema, list):
+        return _array_body_validator(schema[0]) if len(schema) == 1 else None
+    if not _is_schema(schema):
+        return None
+    if schema in _BODY_VALIDATORS:
+        return _BODY_VALIDATORS[schema]
+
+    body_validator = None
+    if getattr(schema, 'type', None) == 'array':
+        body_validator = _array_body_validator(schema.items)
+    elif schema.properties:
+        def body_validator(body):
+            if not isinstance(body, dict):
+                return [{'field': None, 'message': 'The request body must be an object'}]
+            return [{'field': error['field'], 'message': error['message']}
+                    for error in schema.validate_many([body])[1]]
+
+    _BODY_VALIDATORS[schema] = body_validator
+    return body_validator
+
+
+def expected(schema, required=False, validate=False):
     """
     decorator to add request body in method
+
+    With validate=True, the json body of the requests is validated with the schema before the method is called.
+    The invalid requests are answered with a 400 and the list of the errors, the method gets the validated body
+    as `_body` if it has such an argument.
+
     :param schema:
     :param required:
+    :param validate:
     :return:
     """
 
     def decorated(func):
         func.__request_body = {"schema": schema, "required": required}
 
+        if not validate:
+            @wraps(func)
+            def wrapper(self, *args, **kwargs):
+                return func(self, *args, **kwargs)
+
+            return wrapper
+
+        use_body = '_body' in inspect.getfullargspec(func).args
+        body_validator = get_body_validator(schema)
+
         @wraps(func)
         def wrapper(self, *args, **kwargs):
+            body = None
+            data = request.get_data(cache=True)
+            if not data:
+                if required:
+                    abort(400, message='The request body is required')
+            elif not request.is_json:
+                abort(400, message='The request body must be sent as application/json')
+            else:
+                try:
+                    body = json.loads(data)
+                except ValueError:
+                    abort(400, message='The request body is not valid json')
+                if body_validator is not None:
+                    errors = body_validator(body)
+                    if errors:
+                        abort(400, message='The request body is invalid', errors=errors)
+            if use_body:
+                kwargs['_body'] = body
             return func(self, *args, **kwargs)
 
         return wrapper
@@ -1069,6 +1089,10 @@ def parameters(params=[]):
         def get():
             ...
 
+    The parser given as `_parser` is built on the first call and shared by all following requests.
+    `parse_args` keeps no state on the parser, but arguments must not be added to it:
+    use `_parser.copy()` to get a parser of your own.
+
     :param params:
     :return:
     """
@@ -1083,7 +1107,7 @@ def parameters(params=[]):
             """)
 
     def decorated(func):
-        func_args = inspect.getfullargspec(func).args
+        use_parser = '_parser' in inspect.getfullargspec(func).args
         if "__params" in func.__dict__:
             for param in params:
                 func.__params.append({k: v for k, v in dict(param).items()})
@@ -1091,10 +1115,20 @@ def parameters(params=[]):
         else:
             func.__params = params
 
+        # params are completed by the outer decorators and by Api.add_resource,
+        # so the parser can only be built once the view is called
+        parser = None
+
+        def get_view_parser():
+            nonlocal parser
+            if parser is None:
+                parser = get_parser(params)
+            return parser
+
         @wraps(func)
         def wrapper(self, *args, **kwargs):
-            if '_parser' in func_args:
-                kwargs.update({'_parser': get_parser(params)})
+            if use_parser:
+                kwargs.update({'_parser': get_view_parser()})
             return func(self, *args, **kwargs)
 
         return wrapper
@@ -1195,7 +1229,91 @@ def response(response_code, description=None, summary=None, schema=None, no_cont
     return decorated
 
 
-def reorder_with(schema, as_list: bool = False, response_code=200, description=None, summary=None, example=None):
+_SERIALIZERS = {}
+
+
+def _is_schema(obj):
+    return inspect.isclass(obj) and REGISTRY_SCHEMA.get(obj.__name__) is obj
+
+
+def _is_load_only(prop):
+    if _is_schema(prop):
+        prop = prop.definitions()
+    # same as the instantiation of the schemas
+    return isinstance(prop, dict) and 'load_only' in prop and (prop['load_only'] == 'true' or bool(prop['load_only']))
+
+
+def _list_serializer(serialize):
+    def serialize_list(values):
+        return [serialize(v) for v in values]
+
+    return serialize_list
+
+
+def get_serializer(schema):
+    """
+    Returns the function serializing data with a schema, compiled once per Schema class.
+    It keeps the declared properties only, in their order, drops the load_only ones, and serializes the nested
+    schemas and the arrays of schemas in the same pass, without instantiating the schemas.
+    :param schema: A Schema class or a property
+    :return: The function returning the serialized data, None when the data is returned as it is
+    """
+    if _is_schema(schema):
+        if schema in _SERIALIZERS:
+            return _SERIALIZERS[schema]
+        definition = schema.definitions()
+    elif isinstance(schema, dict):
+        definition = schema
+    else:
+        return None
+
+    serializer = None
+    if definition.get('type') == 'array':
+        items = get_serializer(definition.get('items', None))
+        if items is not None:
+            serializer = _list_serializer(items)
+    elif isinstance(definition.get('properties', None), dict):
+        fields = []
+
+        def serializer(obj):
+            result = {}
+            for k, serialize in fields:
+                if k in obj:
+                    v = obj[k]
+                    result[k] = v if serialize is None or v is None else serialize(v)
+            return result
+
+        if schema is not definition:
+            # registered before the properties, which may refer to the schema
+            _SERIALIZERS[schema] = serializer
+        fields.extend((k, get_serializer(prop)) for k, prop in definition['properties'].items()
+                      if not _is_load_only(prop))
+
+    if schema is not definition:
+        _SERIALIZERS[schema] = serializer
+    return serializer
+
+
+def serialize_response(result, response_code, serialize):
+    """
+    Serializes the data of the result of a resource method when its status code (200 when none) is response_code
+    :param result: The result of the method: the data, or a tuple (data, code) or (data, code, headers)
+    :param response_code: The status code of the responses to serialize
+    :param serialize: The serializer of the data
+    :return: The result with the serialized data
+    """
+    if isinstance(result, ResponseBase):
+        return result
+    # the data returned without a code is sent with 200
+    if isinstance(result, tuple):
+        if result and (result[1] if len(result) > 1 else 200) == response_code:
+            return (serialize(result[0]),) + result[1:]
+        return result
+    return serialize(result) if response_code == 200 else result
+
+
+def reorder_with(schema, as_list: bool = False, response_code=200, description=None, summary=None, example=None,
+                 serialize=False):
     """
     Decorator to apply a schema to a response
     :param schema:
@@ -1204,6 +1322,7 @@ def reorder_with(schema, as_list: bool = False, response_code=200, description=N
     :param description:
     :param example:
     :param summary:
+    :param serialize: If True, the data returned with response_code is serialized with the schema by get_serializer
     :return:
     """
 
@@ -1244,17 +1363,25 @@ def reorder_with(schema, as_list: bool = False, response_code=200, description=N
         else:
             func.__custom_example = [_example]
 
-        @wraps(func)
-        def wrapper(self, *args, **kwargs):
+        serializer = get_serializer(schema) if serialize else None
+        if serializer is not None and as_list:
+            serializer = _list_serializer(serializer)
+        if serializer is None:
+            @wraps(func)
+            def wrapper(self, *args, **kwargs):
 
-            return func(self, *args, **kwargs)
+                return func(self, *args, **kwargs)
+        else:
+            @wraps(func)
+            def wrapper(self, *args, **kwargs):
+                return serialize_response(func(self, *args, **kwargs), response_code, serializer)
 
         return wrapper
 
     return decorated
 
 
-def reorder_list_with(schema, response_code=200, description=None, summary=None, example=None):
+def reorder_list_with(schema, response_code=200, description=None, summary=None, example=None, serialize=False):
     """
     Same as reoder_with with as_list = True
     :param schema:
@@ -1262,9 +1389,10 @@ def reorder_list_with(schema, response_code=200, description=None, summary=None,
     :param description
     :param summary
     :param example
+    :param serialize
     :return:
     """
-    return reorder_with(schema, True, response_code, description, summary, example)
+    return reorder_with(schema, True, response_code, description, summary, example, serialize)
 
 
 def __tags_method(func, *_tags):
@@ -0,0 +1,722 @@
+"""
+Table-driven validation of OpenAPI documents.
+
+The fields accepted and required by each kind of object, and the checks of their values, are declared in tables.
+get_errors walks a document once and returns all the errors it finds instead of stopping at the first one.
+"""
+from collections.abc import Iterable
+from functools import lru_cache, partial
+from http import HTTPStatus
+
+from flask_restful_swagger_3 import constants
+
+SPEC_URL = 'https://swagger.io/specification/'
+
+_PARAMETER_LOCATIONS = ('path', 'query', 'header', 'cookie')
+_SECURITY_SCOPED_TYPES = ('oauth2', 'openIdConnect')
+_RESPONSE_KEY_TYPES = frozenset([int, str, HTTPStatus])
+_RESPONSE_CODES = frozenset(constants.responses_object_list)
+# the response codes accepted without conversion
+_RESPONSE_KEYS = _RESPONSE_CODES | frozenset(str(int(code)) for code in _RESPONSE_CODES) | frozenset(['default'])
+# the types of the values which can't be a reference object
+_PLAIN_TYPES = frozenset([str, int, float, bool, list, tuple, type(None)])
+
+
+def _pointer(path):
+    keys = []
+    while path is not None:
+        path, key = path
+        keys.append('/' + str(key).replace('~', '~0').replace('/', '~1'))
+    return ''.join(reversed(keys))
+
+
+def _error(errors, path, message):
+    errors.append({'path': _pointer(path), 'message': message})
+
+
+def _matcher(regex):
+    # one cache per regex, hashing a compiled regex is slower than matching it
+    @lru_cache(maxsize=1024)
+    def match(value):
+        return regex.match(value) is not None
+    return match
+
+
+_match_url = _matcher(constants.Regex.url)
+_match_email = _matcher(constants.Regex.email)
+_match_media_type = _matcher(constants.Regex.media_type)
+
+
+def is_url(url):
+    return isinstance(url, str) and _match_url(url)
+
+
+def is_email(email):
+    return isinstance(email, str) and _match_email(email)
+
+
+def is_media_type(media_type):
+    return isinstance(media_type, str) and _match_media_type(media_type)
+
+
+def is_reference(obj):
+    """Returns True when obj is a reference object, a dict with the single key "$ref" """
+    try:
+        return len(obj.keys()) == 1 and '$ref' in obj
+    except (AttributeError, TypeError):
+        return False
+
+
+class Rule:
+    """
+    Describes a kind of object.
+    :param name: The name of the kind in the error messages
+    :param anchor: The anchor of the kind in the specification
+    :param allowed: The accepted fields, None when any field is accepted
+    :param fields: Maps a field to the check of its value: either a function or a (types, type name) tuple
+    :param required: The required fields
+    """
+    __slots__ = ('name', 'url', 'allowed', 'fields', 'required')
+
+    def __init__(self, name, anchor, allowed=None, fields=None, required=()):
+        self.name = name
+        self.url = SPEC_URL + anchor
+        self.allowed = frozenset(allowed) if allowed is not None else None
+        self.fields = fields or {}
+        self.required = tuple(required)
+
+
+def _check_fields(rule, obj, path, css, errors):
+    if not isinstance(obj, dict):
+        _error(errors, path, 'Invalid {} object. It must be an object but was {}'.format(rule.name, type(obj)))
+        return
+
+    allowed = rule.allowed
+    fields = rule.fields
+    for k, v in obj.items():
+        if allowed is not None and k not in allowed:
+            _error(errors, (path, k), 'Invalid {} object. Unknown field "{}". See {}'.format(rule.name, k, rule.url))
+            continue
+        check = fields.get(k)
+        if check is None:
+            continue
+        if type(check) is tuple:
+            if not isinstance(v, check[0]):
+                _error(errors, (path, k), 'Invalid {} object. "{}" must be a {} but was {}'.format(
+                    rule.name, k, check[1], type(v)))
+        else:
+            check(v, (path, k), css, errors)
+
+    for k in rule.required:
+        if k not in obj:
+            _error(errors, path, 'Invalid {} object. Missing field "{}"'.format(rule.name, k))
+
+
+def _compile(rule):
+    """
+    Compiles a rule into the check of the objects of its kind.
+    The fields are accepted with set operations, the objects with an unknown or missing field or a value of a wrong
+    type are reported field by field by _check_fields.
+    """
+    allowed = rule.allowed
+    required = frozenset(rule.required)
+    checks = {k: check for k, check in rule.fields.items() if type(check) is not tuple}
+    types = tuple((k, check[0]) for k, check in rule.fields.items() if type(check) is tuple)
+
+    def check_fields(obj, path, css, errors):
+        if type(obj) is not dict or (allowed is not None and not allowed.issuperset(obj)) or \
+                not required.issubset(obj):
+            _check_fields(rule, obj, path, css, errors)
+            return
+        for k, types_ in types:
+            if k in obj and not isinstance(obj[k], types_):
+                _check_fields(rule, obj, path, css, errors)
+                return
+        for k, v in obj.items():
+            check = checks.get(k)
+            if check is not None:
+                check(v, (path, k), css, errors)
+
+    return check_fields
+
+
+def _optional(check, obj, path, css, errors):
+    # empty objects are not checked
+    if obj:
+        check(obj, path, css, errors)
+
+
+def _ref_or(check, obj, path, css, errors):
+    if not is_reference(obj):
+        check(obj, path, css, errors)
+
+
+def _map_of(check, name, obj, path, css, errors):
+    if not isinstance(obj, dict):
+        _error(errors, path, 'Invalid {} object. It must be an object but was {}'.format(name, type(obj)))
+        return
+    for k, v in obj.items():
+        check(v, (path, k), css, errors)
+
+
+def _list_of(check, name, strict, obj, path, css, errors):
+    # the lists which are not strict may be any iterable
+    if type(obj) is not list and (strict or isinstance(obj, str) or not isinstance(obj, Iterable)):
+        _error(errors, path, 'Invalid {} object. It must be a list but was {}'.format(name, type(obj)))
+        return
+    for i, v in enumerate(obj):
+        check(v, (path, i), css, errors)
+
+
+def _url(anchor, obj, path, css, errors):
+    if not is_url(obj):
+        _error(errors, path, 'Invalid url. See {}{}'.format(SPEC_URL, anchor))
+
+
+def _forbidden(anchor, obj, path, css, errors):
+    _error(errors, path, '"{}" must not be specified. See {}{}'.format(path[1], SPEC_URL, anchor))
+
+
+def _enum(obj, path, css, errors):
+    if not isinstance(obj, list) or not all(isinstance(x, str) for x in obj):
+        _error(errors, path, 'Invalid server variables object. Enum must be a list of strings. '
+                             'See {}#ServerVariablesObject'.format(SPEC_URL))
+
+
+def _email(obj, path, css, errors):
+    if not is_email(obj):
+        _error(errors, path, 'Invalid email. See {}#contactObject'.format(SPEC_URL))
+
+
+def _reference(obj, path, css, errors):
+    if not is_reference(obj):
+        _error(errors, path, 'Invalid reference object. It may only contain key "$ref"')
+
+
+# The acceptors return True when the objects of the most frequent kinds are valid, without the overhead of the
+# checks. They return False on anything unusual, the object is then walked by its check to report the errors.
+
+def _accepts_schema(obj):
+    if type(obj) is not dict:
+        return False
+    return _PLAIN_TYPES.issuperset(map(type, obj.values())) and \
+        ('required' not in obj or type(obj['required']) is list)
+
+
+def _accepts_content(obj):
+    if type(obj) is not dict:
+        return False
+    for k, v in obj.items():
+        if type(k) is not str or not _match_media_type(k) or type(v) is not dict or 'examples' in v:
+            return False
+        if 'schema' in v:
+            schema = v['schema']
+            if type(schema) is not dict:
+                return False
+            if not _PLAIN_TYPES.issuperset(map(type, schema.values())) or \
+                    'required' in schema and type(schema['required']) is not list:
+                return False
+    return True
+
+
+def _accepts_parameters(obj):
+    if type(obj) is not list:
+        return False
+    for v in obj:
+        if type(v) is not dict or not _PARAMETER_FIELDS.issuperset(v) or 'name' not in v or \
+                v.get('in') not in _PARAMETER_LOCATIONS:
+            return False
+        if 'schema' in v:
+            schema = v['schema']
+            if type(schema) is not dict:
+                return False
+            if not _PLAIN_TYPES.issuperset(map(type, schema.values())) or \
+                    'required' in schema and type(schema['required']) is not list:
+                return False
+    return True
+
+
+def _accepts_responses(obj):
+    if type(obj) is not dict:
+        return False
+    for k, v in obj.items():
+        if k not in _RESPONSE_KEYS or type(k) not in _RESPONSE_KEY_TYPES or type(v) is not dict or \
+                'description' not in v or not _PLAIN_RESPONSE_FIELDS.issuperset(v):
+            return False
+        if 'content' in v and not _accepts_content(v['content']):
+            return False
+    return True
+
+
+def _accepts_operation(obj):
+    if type(obj) is not dict or not _OPERATION_RULE.allowed.issuperset(obj) or 'responses' not in obj:
+        return False
+    for k, v in obj.items():
+        if k == 'responses':
+            if not _accepts_responses(v):
+                return False
+        elif k == 'parameters':
+            if not _accepts_parameters(v):
+                return False
+        elif k == 'requestBody':
+            if type(v) is not dict or 'content' not in v or not _accepts_content(v['content']):
+                return False
+        elif k not in _OPERATION_TYPES or not isinstance(v, _OPERATION_TYPES[k]):
+            return False
+    return True
+
+
+def _accepts_path_item(obj):
+    if type(obj) is not dict or not _PATH_ITEM_RULE.allowed.issuperset(obj):
+        return False
+    for k, v in obj.items():
+        if k in _OPERATION_METHODS:
+            if not _accepts_operation(v):
+                return False
+        elif k not in _UNCHECKED_PATH_ITEM_FIELDS:
+            return False
+    return True
+
+
+_PLAIN_RESPONSE_FIELDS = frozenset(['description', 'content'])
+_OPERATION_METHODS = frozenset(constants.operation_object_list)
+_UNCHECKED_PATH_ITEM_FIELDS = frozenset(['$ref', 'summary', 'description'])
+
+
+def _operation(obj, path, css, errors):
+    if not _accepts_operation(obj):
+        _OPERATION(obj, path, css, errors)
+
+
+def _schema(obj, path, css, errors):
+    if _accepts_schema(obj):
+        return
+    if not isinstance(obj, dict):
+        _error(errors, path, 'Invalid schema object. It must be an object but was {}'.format(type(obj)))
+        return
+
+    for k, v in obj.items():
+        # nested objects must be references
+        if type(v) in _PLAIN_TYPES or not hasattr(v, 'keys'):
+            if k == 'required' and not isinstance(v, list):
+                _error(errors, (path, k), 'Invalid schema object. "{0}" must be a list but was {1}'.format(k, type(v)))
+        elif not is_reference(v):
+            _error(errors, (path, k), 'Invalid reference object. It may only contain key "$ref"')
+
+
+def _map_schema(obj, path, css, errors):
+    if not isinstance(obj, dict):
+        _error(errors, path, 'Invalid schemas object. It must be an object but was {}'.format(type(obj)))
+        return
+    for k, v in obj.items():
+        try:
+            # the schemas with properties are built from Schema classes
+            if 'properties' in v:
+                continue
+        except TypeError:
+            pass
+        _schema(v, (path, k), css, errors)
+
+
+def _parameter(obj, path, css, errors):
+    if not isinstance(obj, dict):
+        _error(errors, path, 'Invalid parameter object. It must be an object but was {}'.format(type(obj)))
+        return
+
+    for k in obj:
+        if k not in _PARAMETER_FIELDS:
+            _error(errors, (path, k), 'Invalid parameter object. Unknown field "{}". See {}#parameterObject'.format(
+                k, SPEC_URL))
+    if 'name' not in obj:
+        _error(errors, path, 'Invalid parameter object. Missing field "name"')
+    if 'in' not in obj:
+        _error(errors, path, 'Invalid parameter object. Missing field "in"')
+    elif obj['in'] not in _PARAMETER_LOCATIONS:
+        _error(errors, (path, 'in'), 'Invalid parameter object. '
+                                     'Value of field "in" must be path, query, header, cookie was "{0}"'.format(obj['in']))
+    if 'schema' in obj:
+        _schema(obj['schema'], (path, 'schema'), css, errors)
+
+
+_PARAMETER_FIELDS = frozenset(constants.parameter_object_list)
+
+
+def _map_media_type(obj, path, css, errors):
+    if not isinstance(obj, dict):
+        _error(errors, path, 'Invalid content object. It must be an object but was {}'.format(type(obj)))
+        return
+
+    for k, v in obj.items():
+        if not is_media_type(k):
+            _error(errors, (path, k), 'Invalid content object, the field must match the following pattern '
+                                      '("application/json", "*/*" ...").. See {}#mediaTypeObject'.format(SPEC_URL))
+            continue
+        _media_type(v, (path, k), css, errors)
+
+
+def _media_type(obj, path, css, errors):
+    if not isinstance(obj, dict):
+        _error(errors, path, 'Invalid media type object. It must be an object but was {}'.format(type(obj)))
+        return
+    # the other fields of the media type object are not checked
+    if 'schema' in obj:
+        _schema(obj['schema'], (path, 'schema'), css, errors)
+    if 'examples' in obj:
+        _MAP_EXAMPLE(obj['examples'], (path, 'examples'), css, errors)
+
+
+def _responses(obj, path, css, errors):
+    if not isinstance(obj, dict):
+        _error(errors, path, 'Invalid responses object. It must be an object but was {}'.format(type(obj)))
+        return
+
+    for k, v in obj.items():
+        if k not in _RESPONSE_KEYS or type(k) not in _RESPONSE_KEY_TYPES:
+            _response_code(k, (path, k), errors)
+        if not is_reference(v):
+            _RESPONSE(v, (path, k), css, errors)
+
+
+def _response_code(k, path, errors):
+    if type(k) not in _RESPONSE_KEY_TYPES:
+        _error(errors, path, 'Invalid responses object. "{}" must be a "int" (HttpStatusCode), '
+                             'a "HTTPStatus enum" or a "str" (default), but was {}'.format(k, type(k)))
+        return
+    try:
+        k = int(k)
+    except ValueError:
+        pass
+    if k not in _RESPONSE_CODES and k != 'default':
+        _error(errors, path, 'Invalid responses object. it must be a HttpStatusCode, a HTTPStatus enum '
+                             'or "default" but was {}'.format(k))
+
+
+def _paths(obj, path, css, errors):
+    if not isinstance(obj, dict):
+        _error(errors, path, 'Invalid paths object. It must be an object but was {}'.format(type(obj)))
+        return
+
+    for k, v in obj.items():
+        if type(k) is not str:
+            _error(errors, (path, k), 'Invalid paths object. "{}" must be a str but was "{}"'.format(k, type(k)))
+            continue
+        if not k.startswith('/'):
+            _error(errors, (path, k), 'Invalid paths object. "{}" must start with a leading slash'.format(k))
+        if k.endswith('/'):
+            _error(errors, (path, k), 'Invalid paths object. "{}" must not have an ending slash'.format(k))
+        if not _accepts_path_item(v):
+            _PATH_ITEM(v, (path, k), css, errors)
+
+
+def _callback(obj, path, css, errors):
+    if not isinstance(obj, dict):
+        _error(errors, path, 'Invalid callback object. It must be an object but was {}'.format(type(obj)))
+        return
+    for k, v in obj.items():
+        if not _accepts_path_item(v):
+            _PATH_ITEM(v, (path, k), css, errors)
+
+
+def _security_requirement(obj, path, css, errors):
+    if not css:
+        _error(errors, path, 'Each property of security requirement object must correspond '
+                             'to a security scheme declared in the Security Schemes under the Components Object, '
+                             'but the Security Schemes is not declared. '
+                             'See {}#SecurityRequirementObject'.format(SPEC_URL))
+        return
+    if not isinstance(css, dict):
+        _error(errors, path, 'Invalid security requirement object. The Security Schemes under the Components Object '
+                             'must be an object but was {}. See {}#ComponentsObject'.format(type(css), SPEC_URL))
+        return
+    if not isinstance(obj, dict):
+        _error(errors, path, 'Invalid security requirement object. It must be an object but was {}'.format(type(obj)))
+        return
+
+    for k, v in obj.items():
+        if type(v) is not list:
+            _error(errors, (path, k), 'Invalid security requirement object. '
+                                      '"{}" must be a list, but was {}'.format(k, type(v)))
+            continue
+        if k not in css:
+            _error(errors, (path, k), 'Each property of security requirement object must correspond '
+                                      'to a security scheme declared in the Security Schemes under the Components '
+                                      'Object, See {}#SecurityRequirementObject'.format(SPEC_URL))
+            continue
+        scheme = css[k]
+        _type = scheme.get('type', None) if isinstance(scheme, dict) else None
+        if _type not in _SECURITY_SCOPED_TYPES and len(v) > 0:
+            _error(errors, (path, k), 'Invalid security requirement object. '
+                                      '"{}" must be empty except for "oauth2", "openIdConnect"'.format(k))
+
+
+def _security_scheme(obj, path, css, errors):
+    _SECURITY_SCHEME_FIELDS(obj, path, css, errors)
+    if not isinstance(obj, dict) or 'type' not in obj:
+        return
+
+    _type = obj['type']
+    if _type not in constants.security_scheme_object_type_list:
+        _error(errors, (path, 'type'), '"type" must be one of {}'.format(
+            ", ".join(constants.security_scheme_object_type_list)))
+        return
+
+    for field in _SECURITY_SCHEME_TYPE_FIELDS[_type]:
+        if field not in obj:
+            _error(errors, path, 'Invalid security scheme object. Missing field "{}" when type is "{}"'.format(
+                field, _type))
+    if _type == 'http' and 'scheme' in obj and obj['scheme'] not in constants.security_scheme_object_scheme_list:
+        _error(errors, (path, 'scheme'), 'Invalid security scheme object. "scheme" must be one of {} '.format(
+            ", ".join(constants.security_scheme_object_scheme_list)))
+    if _type == 'oauth2' and 'flows' in obj:
+        _OAUTH_FLOWS(obj['flows'], (path, 'flows'), css, errors)
+    if _type == 'openIdConnect' and 'openIdConnectUrl' in obj:
+        _url('#securitySchemeObject', obj['openIdConnectUrl'], (path, 'openIdConnectUrl'), css, errors)
+
+
+_SECURITY_SCHEME_TYPE_FIELDS = {
+    'apiKey': ('name', 'in'),
+    'http': ('scheme',),
+    'oauth2': ('flows',),
+    'openIdConnect': ('openIdConnectUrl',)
+}
+
+
+def _oauth_flow(key, obj, path, css, errors):
+    _OAUTH_FLOW_FIELDS(obj, path, css, errors)
+    if not isinstance(obj, dict):
+        return
+
+    if 'scopes' in obj:
+        scopes = obj['scopes']
+        if not isinstance(scopes, dict) or not all(type(v) is str for v in scopes.values()):
+            _error(errors, (path, 'scopes'), 'Invalid oauth flows object. "scopes" must be a dict of string')
+    for field in _OAUTH_FLOW_URLS[key]:
+        if field not in obj:
+            _error(errors, path, 'Invalid oauth flows object. Missing field "{}"'.format(field))
+        else:
+            _url('#OAuthFlowsObject', obj[field], (path, field), css, errors)
+
+
+_OAUTH_FLOW_URLS = {
+    'implicit': ('authorizationUrl',),
+    'password': ('tokenUrl',),
+    'clientCredentials': ('tokenUrl',),
+    'authorizationCode': ('authorizationUrl', 'tokenUrl')
+}
+
+
+def _components(obj, path, css, errors):
+    # the callbacks are checked with the security schemes of the components
+    css = obj.get('securitySchemes', None) if isinstance(obj, dict) else None
+    _COMPONENTS_FIELDS(obj, path, css, errors)
+
+
+def _open_api(obj, path, css, errors):
+    components = obj.get('components', None) if isinstance(obj, dict) else None
+    css = components.get('securitySchemes', None) if isinstance(components, dict) else None
+    _OPEN_API_FIELDS(obj, path, css, errors)
+
+
+_SERVER_VARIABLES = _compile(Rule('server variables', '#ServerVariablesObject',
+                                                 constants.server_variables_object_list, {
+                                                     'enum': _enum
+                                                 }, ['default']))
+
+_SERVER_FIELDS = _compile(Rule('server', '#ServerObject', constants.server_object_list, {
+    'url': partial(_url, '#ServerObject'),
+    'variables': _SERVER_VARIABLES
+}, ['url']))
+
+
+def _server(obj, path, css, errors):
+    if not isinstance(obj, dict):
+        _error(errors, path, 'Invalid server object. See {}#ServerObject'.format(SPEC_URL))
+        return
+    _SERVER_FIELDS(obj, path, css, errors)
+
+
+_SERVERS = partial(_list_of, _server, 'servers', True)
+
+_EXTERNAL_DOCS = _compile(Rule('external documentation', '#externalDocumentationObject',
+                                             constants.external_doc_object_list, {
+                                                 'description': (str, 'str'),
+                                                 # only the type of the url is checked
+                                                 'url': (str, 'str')
+                                             }, ['url']))
+
+_EXAMPLE = _compile(Rule('example', '#ExampleObject', constants.example_object_list, {
+    'summary': (str, 'str'),
+    'description': (str, 'str'),
+    'externalValue': (str, 'str')
+}))
+_MAP_EXAMPLE = partial(_map_of, partial(_ref_or, _EXAMPLE), 'examples')
+
+_HEADER = _compile(Rule('header', '#HeaderObject', constants.headers_object_list, {
+    'name': partial(_forbidden, '#HeaderObject'),
+    'in': partial(_forbidden, '#HeaderObject'),
+    'schema': _schema
+}))
+_MAP_HEADER = partial(_map_of, partial(_ref_or, _HEADER), 'headers')
+
+_LINK = _compile(Rule('link', '#linkObject', constants.link_object_list, {
+    'operationRef': (str, 'str'),
+    'operationId': (str, 'str'),
+    'description': (str, 'str'),
+    'server': _server
+}))
+
+_RESPONSE = _compile(Rule('response', '#responseObject', ['description', 'headers', 'content', 'links'], {
+    'headers': partial(_ref_or, _MAP_HEADER),
+    'content': _map_media_type,
+    'links': _LINK
+}, ['description']))
+
+_REQUEST_BODY = _compile(Rule('request body', '#requestBodyObject', None, {
+    'content': _map_media_type
+}, ['content']))
+
+_SECURITY = partial(_list_of, _security_requirement, 'operation', True)
+
+_OPERATION_RULE = Rule('operation', '#operationObject', [
+    'tags', 'summary', 'description', 'operationId', 'requestBody', 'deprecated', 'externalDocs', 'parameters',
+    'responses', 'security', 'callbacks'
+], {
+    'tags': (list, 'list'),
+    'summary': (str, 'string'),
+    'description': (str, 'string'),
+    'operationId': (str, 'string'),
+    'requestBody': _REQUEST_BODY,
+    'deprecated': (bool, 'bool'),
+    'externalDocs': _EXTERNAL_DOCS,
+    'parameters': partial(_list_of, _parameter, 'operation', False),
+    'responses': _responses,
+    'security': _SECURITY,
+    'callbacks': _callback
+}, ['responses'])
+_OPERATION = _compile(_OPERATION_RULE)
+_OPERATION_TYPES = {k: check[0] for k, check in _OPERATION_RULE.fields.items() if type(check) is tuple}
+
+_PATH_ITEM_RULE = Rule(
+    'path item', '#pathItemObject',
+    ('$ref', 'servers', 'parameters', 'summary', 'description') + constants.operation_object_list,
+    dict({
+        'servers': _SERVERS,
+        'parameters': partial(_list_of, partial(_ref_or, _parameter), 'path item', False)
+    }, **{method: _operation for method in constants.operation_object_list}))
+_PATH_ITEM = _compile(_PATH_ITEM_RULE)
+
+_SECURITY_SCHEME_FIELDS = _compile(Rule('security scheme', '#SecuritySchemeObject', constants.security_scheme_list,
+                                        required=['type']))
+
+_OAUTH_FLOW_FIELDS = _compile(Rule('oauth flows', '#OAuthFlowsObject', constants.oauth_flows_object_sub_level_list, {
+    'refreshUrl': partial(_url, '#OAuthFlowsObject')
+}, ['scopes']))
+
+_OAUTH_FLOWS = _compile(Rule('oauth flows', '#OAuthFlowsObject', constants.oauth_flows_object_list, {
+    key: partial(_oauth_flow, key) for key in constants.oauth_flows_object_list
+}))
+
+_MAP_RESPONSES = partial(_map_of, partial(_ref_or, _responses), 'responses')
+_MAP_PARAMETER = partial(_map_of, partial(_ref_or, _parameter), 'parameters')
+_MAP_REQUEST_BODY = partial(_map_of, partial(_ref_or, _REQUEST_BODY), 'request bodies')
+_MAP_SECURITY_SCHEME = partial(_map_of, partial(_ref_or, _security_scheme), 'security schemes')
+_MAP_LINK = partial(_map_of, partial(_ref_or, _LINK), 'links')
+
+_COMPONENTS_FIELDS = _compile(Rule('components', '#ComponentsObject', constants.components_object_list, {
+    'schemas': _map_schema,
+    'responses': _MAP_RESPONSES,
+    'parameters': _MAP_PARAMETER,
+    'examples': _MAP_EXAMPLE,
+    'requestBodies': _MAP_REQUEST_BODY,
+    'headers': _MAP_HEADER,
+    'securitySchemes': _MAP_SECURITY_SCHEME,
+    'links': _MAP_LINK,
+    'callbacks': _callback
+}))
+
+_CONTACT = partial(_optional, _compile(Rule('contact', '#contactObject', constants.contact_object_list, {
+    'email': _email
+})))
+
+_LICENSE = partial(_optional, _compile(Rule('license', '#licenseObject', constants.license_object_list, {
+    'url': partial(_url, '#licenseObject')
+}, ['name'])))
+
+_INFO = _compile(Rule('info', '#infoObject', constants.info_object_list, {
+    'contact': _CONTACT,
+    'license': _LICENSE
+}, ['title', 'version']))
+
+_TAG = _compile(Rule('tag', '#TagObject', constants.tag_object_list, {
+    'name': (str, 'str'),
+    'description': (str, 'str'),
+    'externalDocs': _EXTERNAL_DOCS
+}, ['name']))
+
+_TAGS = partial(_list_of, _TAG, 'tags', True)
+
+_OPEN_API_FIELDS = _compile(Rule('open api', '#OpenAPIObject', constants.open_api_object_list, {
+    'openapi': (str, 'str'),
+    'info': _INFO,
+    'servers': _SERVERS,
+    'paths': _paths,
+    'components': _components,
+    'security': _SECURITY,
+    'tags': _TAGS,
+    'externalDocs': _EXTERNAL_DOCS
+}, ['openapi', 'info', 'paths', 'components']))
+
+# The checks of each kind of object, by name
+CHECKS = {
+    'open_api': _open_api,
+    'info': _INFO,
+    'contact': _CONTACT,
+    'license': _LICENSE,
+    'servers': _SERVERS,
+    'server': _server,
+    'server_variables': _SERVER_VARIABLES,
+    'paths': _paths,
+    'path_item': _PATH_ITEM,
+    'operation': _operation,
+    'callback': _callback,
+    'parameter': _parameter,
+    'map_parameter': _MAP_PARAMETER,
+    'reference': _reference,
+    'external_documentation': _EXTERNAL_DOCS,
+    'responses': _responses,
+    'map_responses': _MAP_RESPONSES,
+    'response': _RESPONSE,
+    'request_body': _REQUEST_BODY,
+    'map_request_body': _MAP_REQUEST_BODY,
+    'map_media_type': _map_media_type,
+    'media_type': _media_type,
+    'security': _SECURITY,
+    'security_requirement': _security_requirement,
+    'security_scheme': _security_scheme,
+    'map_security_scheme': _MAP_SECURITY_SCHEME,
+    'oauth_flows': _OAUTH_FLOWS,
+    'components': _components,
+    'schema': _schema,
+    'map_schema': _map_schema,
+    'header': _HEADER,
+    'map_header': _MAP_HEADER,
+    'link': _LINK,
+    'map_link': _MAP_LINK,
+    'example': _EXAMPLE,
+    'map_example': _MAP_EXAMPLE,
+    'tags': _TAGS,
+    'tag': _TAG
+}
+
+
+def get_errors(obj, kind='open_api', components_security_schemes=None):
+    """
+    Validates an object of an OpenAPI document.
+    :param obj: The object to validate
+    :param kind: The kind of obj, one of the keys of CHECKS
+    :param components_security_schemes: The security schemes of the document, used by the security requirements
+    :return: The list of the errors, as dicts with the "path" (a JSON pointer relative to obj) and the "message"
+    """
+    errors = []
+    CHECKS[kind](obj, None, components_security_schemes, errors)
+    return errors
@@ -22,6 +22,19 @@ class BaseTest:
         cls.ctx.pop()
 
 
+class BaseTestSpecApi(BaseTest):
+    api = None
+    # the options of the Api
+    api_kwargs = {}
+
+    @classmethod
+    def setup_class(cls):
+        super().setup_class()
+        cls.api = Api(cls.app, **cls.api_kwargs)
+        cls.api.add_resource(p_resource(), '/api/users')
+        cls.api.add_resource(one_resource(), '/some_data')
+
+
 class BaseTestApi:
     app = None
     api = None
@@ -117,3 +130,4 @@ class NotAuthorizeApi:
     @classmethod
     def teardown_class(cls):
         cls.ctx.pop()
+        swagger.auth = swagger._default_auth
@@ -1,8 +1,19 @@
+import os
+import re
+import csv
+import sys
 import copy
+import gzip
+import hashlib
 import json
 import pytest
-from flask import Blueprint
-from tests.base_test import BaseTest, BaseTestApi, NotAuthorizeApi, BaseTestApiBlueprint, BaseTestApiNoContext
+import subprocess
+import flask_restful_swagger_3
+from flask import Flask, Blueprint, request
+from tests.base_test import (BaseTest, BaseTestApi, NotAuthorizeApi, BaseTestApiBlueprint, BaseTestApiNoContext,
+                             BaseTestSpecApi)
+from tests.fixtures.fixture_resources import p_resource, one_resource, parse_resource
+from tests.fixtures.fixture_models import UserModel
 from flask_restful_swagger_3 import swagger, get_swagger_blueprint, Api, Resource
 
 
@@ -292,6 +303,138 @@ class TestApi(BaseTestApi):
         assert properties['password_arg']['type'] == 'password'
 
 
+    def test_auth_required_skips_default_auth(self, monkeypatch):
+        def fail(rule):
+            raise AssertionError('path should not be extracted')
+
+        monkeypatch.setattr(flask_restful_swagger_3, 'extract_rule_swagger_path', fail)
+        r = self.client_app.get('/users/1?name=test')
+        assert r.status_code == 200
+
+    def test_auth_required_caches_swagger_path(self, monkeypatch):
+        calls = []
+
+        def recording_auth(api_key, endpoint, method):
+            calls.append((api_key, endpoint, method))
+            return api_key == 'key'
+
+        monkeypatch.setattr(swagger, 'auth', recording_auth)
+        swagger.extract_rule_swagger_path.cache_clear()
+
+        assert self.client_app.get('/users/1?name=test&api_key=key').status_code == 200
+        assert self.client_app.get('/users/2?name=test').status_code == 401
+        assert calls == [('key', ('/users/{user_id}', ['int:user_id']), 'GET'),
+                         (None, ('/users/{user_id}', ['int:user_id']), 'GET')]
+        assert swagger.extract_rule_swagger_path.cache_info().hits == 1
+
+    def test_spec_is_compiled_once_per_generation(self, monkeypatch):
+        calls = []
+        get_swagger_doc = swagger.get_swagger_doc
+
+        def counting_get_swagger_doc(*args, **kwargs):
+            calls.append(args)
+            return get_swagger_doc(*args, **kwargs)
+
+        monkeypatch.setattr(swagger, 'get_swagger_doc', counting_get_swagger_doc)
+
+        first = self.client_app.get('/api/doc/swagger.json')
+        second = self.client_app.get('/api/doc/swagger.json')
+        assert first.status_code == second.status_code == 200
+        assert first.data == second.data
+        assert first.content_type == 'application/json'
+        assert len(calls) <= 1
+
+    def test_spec_is_recompiled_after_add_resource(self, no_converter_resource):
+        generation = self.api.spec_generation
+        r = self.client_app.get('/api/doc/swagger.json')
+        assert '/compiled/{id}' not in json.loads(r.data.decode())['paths']
+
+        self.api.add_resource(no_converter_resource, '/compiled/<id>', endpoint='compiled')
+        assert self.api.spec_generation == generation + 1
+
+        r = self.client_app.get('/api/doc/swagger.json')
+        data = json.loads(r.data.decode())
+        assert '/compiled/{id}' in data['paths']
+        assert list(data['paths']) == sorted(data['paths'])
+
+
+    def test_spec_is_not_modified(self):
+        r = self.client_app.get('/api/doc/swagger.json')
+        etag = r.headers['ETag']
+        assert r.headers.get('Cache-Control') is None
+
+        r = self.client_app.get('/api/doc/swagger.json', headers={'If-None-Match': etag})
+        assert r.status_code == 304
+        assert r.data == b''
+
+        r = self.client_app.get('/api/doc/swagger.json', headers={'If-None-Match': '"other"'})
+        assert r.status_code == 200
+        assert r.headers['ETag'] == etag
+
+    def test_spec_etag_changes_after_add_resource(self, no_converter_resource):
+        etag = self.client_app.get('/api/doc/swagger.json').headers['ETag']
+        self.api.add_resource(no_converter_resource, '/etag/<id>', endpoint='etag')
+
+        r = self.client_app.get('/api/doc/swagger.json', headers={'If-None-Match': etag})
+        assert r.status_code == 200
+        assert r.headers['ETag'] != etag
+
+    def test_spec_etag_varies_by_auth_filter(self, monkeypatch):
+        monkeypatch.setattr(swagger, 'auth', lambda api_key, endpoint, method: api_key == 'admin' or method == 'get')
+
+        admin = self.client_app.get('/api/doc/swagger.json?api_key=admin')
+        guest = self.client_app.get('/api/doc/swagger.json?api_key=guest')
+        other_guest = self.client_app.get('/api/doc/swagger.json?api_key=other_guest')
+        assert admin.headers['ETag'] != guest.headers['ETag']
+        assert guest.headers['ETag'] == other_guest.headers['ETag']
+        assert guest.data == other_guest.data
+        assert 'post' not in json.loads(guest.data.decode())['paths']['/api/users']
+
+        r = self.client_app.get('/api/doc/swagger.json?api_key=guest', headers={'If-None-Match': admin.headers['ETag']})
+        assert r.status_code == 200
+
+    def test_spec_is_filtered_by_auth_many(self, monkeypatch):
+        calls = []
+
+        def auth_many(api_key, operations):
+            calls.append((api_key, list(operations)))
+            return {(endpoint, method) for endpoint, method in operations if method == 'get'} | {('/unknown', 'get')}
+
+        def auth(api_key, endpoint, method):
+            raise AssertionError('auth should not be called')
+
+        monkeypatch.setattr(swagger, 'auth_many', auth_many)
+        monkeypatch.setattr(swagger, 'auth', auth)
+
+        r = self.client_app.get('/api/doc/swagger.json?api_key=key')
+        assert r.status_code == 200
+        paths = json.loads(r.data.decode())['paths']
+        assert len(calls) == 1
+        assert calls[0][0] == 'key'
+        assert ('/api/users', 'post') in calls[0][1]
+        assert '/unknown' not in paths
+        assert all(list(view) == ['get'] for view in paths.values())
+
+    def test_add_resource_only_validates_what_it_adds(self, monkeypatch, no_converter_resource):
+        calls = []
+        monkeypatch.setattr(flask_restful_swagger_3, 'validate_open_api_object', calls.append)
+        self.api.add_resource(no_converter_resource, '/incremental/<id>', endpoint='incremental')
+        assert calls == []
+
+        self.api.finalize()
+        assert calls == [self.api.open_api_object]
+
+    def test_finalize_validates_whole_open_api_object(self):
+        self.api.finalize()
+
+        self.api.open_api_object['tags'] = 'not a list'
+        try:
+            with pytest.raises(swagger.ValidationError):
+                self.api.finalize()
+        finally:
+            self.api.open_api_object['tags'] = []
+
+
 class TestApiNoContext(BaseTestApiNoContext):
     def test_get_swagger_blueprint(self):
         blueprint = get_swagger_blueprint(self.api.open_api_object, swagger_blueprint_name="swagger_app")
@@ -509,6 +652,522 @@ class TestBlueprintUpdateAuthorizations(BaseTest):
         assert spec['components']['securitySchemes'] == expected_authorizations
 
 
+class TestPrecompressedStatic(BaseTest):
+    @classmethod
+    def setup_class(cls):
+        super().setup_class()
+        swagger_object = {'openapi': '3.0.2', 'info': {'title': 'Example', 'version': '1'},
+                          'paths': {}, 'components': {}}
+        cls.app.register_blueprint(get_swagger_blueprint(swagger_object, precompressed_static=True))
+
+    def get_bundle_url(self):
+        index = self.client_app.get('/').data.decode()
+        urls = re.findall(r'src="/(swagger-ui-bundle\.[0-9a-f]+\.js)"', index)
+        assert len(urls) == 1
+        return urls[0]
+
+    def test_index_links_fingerprinted_assets(self):
+        index = self.client_app.get('/').data.decode()
+        assert 'href="/swagger-ui.css"' not in index
+        assert re.search(r'href="/swagger-ui\.[0-9a-f]+\.css"', index)
+        assert re.search(r'src="/swagger-ui-standalone-preset\.[0-9a-f]+\.js"', index)
+
+    def test_fingerprinted_asset_is_immutable(self):
+        r = self.client_app.get('/' + self.get_bundle_url())
+        assert r.status_code == 200
+        assert 'immutable' in r.headers['Cache-Control']
+        assert r.data == self.client_app.get('/swagger-ui-bundle.js').data
+
+    def test_asset_is_served_gzipped(self):
+        plain = self.client_app.get('/swagger-ui-bundle.js')
+        r = self.client_app.get('/swagger-ui-bundle.js', headers={'Accept-Encoding': 'gzip'})
+        assert r.status_code == 200
+        assert r.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in r.headers['Vary']
+        assert len(r.data) < len(plain.data)
+        assert gzip.decompress(r.data) == plain.data
+        assert 'Content-Encoding' not in plain.headers
+
+    def test_asset_is_not_modified(self):
+        r = self.client_app.get('/swagger-ui.css', headers={'Accept-Encoding': 'gzip'})
+        r = self.client_app.get('/swagger-ui.css', headers={'Accept-Encoding': 'gzip',
+                                                              'If-None-Match': r.headers['ETag']})
+        assert r.status_code == 304
+
+    def test_other_static_files_are_still_served(self):
+        r = self.client_app.get('/oauth2-redirect.html')
+        assert r.status_code == 200
+        assert 'Content-Encoding' not in r.headers
+
+
+class TestSpecCacheControl(BaseTestSpecApi):
+    api_kwargs = {'spec_cache_control': 'public, max-age=60'}
+
+    def test_spec_cache_control(self):
+        r = self.client_app.get('/api/doc/swagger.json')
+        assert r.status_code == 200
+        assert r.headers['Cache-Control'] == 'public, max-age=60'
+
+
+class TestAuthCache(BaseTestSpecApi):
+    api_kwargs = {'auth_cache_size': 2, 'auth_cache_ttl': 60}
+
+    @pytest.fixture(autouse=True)
+    def recording_auth(self, monkeypatch):
+        self.calls = []
+
+        def auth(api_key, endpoint, method):
+            self.calls.append(api_key)
+            return api_key == 'admin' or method == 'get'
+
+        monkeypatch.setattr(swagger, 'auth', auth)
+
+    def get_spec(self, api_key):
+        r = self.client_app.get('/api/doc/swagger.json?api_key={}'.format(api_key))
+        assert r.status_code == 200
+        return json.loads(r.data.decode())
+
+    def test_auth_is_called_once_per_api_key(self):
+        admin = self.get_spec('admin')
+        calls = len(self.calls)
+        assert calls > 0
+        assert self.get_spec('admin') == admin
+        assert len(self.calls) == calls
+
+        guest = self.get_spec('guest')
+        assert 'post' in admin['paths']['/api/users']
+        assert 'post' not in guest['paths']['/api/users']
+        assert self.calls.count('guest') == calls
+
+    def test_least_recently_used_api_key_is_evicted(self):
+        for api_key in ['a', 'b', 'a', 'c']:
+            self.get_spec(api_key)
+        assert self.calls.count('a') == self.calls.count('b') == self.calls.count('c')
+
+        self.calls.clear()
+        self.get_spec('a')
+        assert self.calls == []
+        self.get_spec('b')
+        assert set(self.calls) == {'b'}
+
+    def test_api_key_expires(self, monkeypatch):
+        self.get_spec('admin')
+        self.calls.clear()
+
+        now = swagger.monotonic()
+        monkeypatch.setattr(swagger, 'monotonic', lambda: now + 61)
+        self.get_spec('admin')
+        assert set(self.calls) == {'admin'}
+
+    def test_add_resource_invalidates_api_keys(self, no_converter_resource):
+        self.get_spec('admin')
+        self.calls.clear()
+
+        self.api.add_resource(no_converter_resource, '/cached/<id>', endpoint='cached')
+        assert '/cached/{id}' in self.get_spec('admin')['paths']
+        assert set(self.calls) == {'admin'}
+
+
+class TestStreamSpec(BaseTestSpecApi):
+    api_kwargs = {'stream_spec': True}
+
+    def test_spec_is_streamed(self):
+        r = self.client_app.get('/api/doc/swagger.json')
+        assert r.status_code == 200
+        assert r.is_streamed
+        assert r.content_type == 'application/json'
+
+        spec = json.loads(r.data.decode())
+        assert spec == json.loads(json.dumps(swagger.get_swagger_doc(self.api.open_api_object)))
+        assert list(spec)[-2:] == ['paths', 'components']
+
+    def test_streamed_spec_is_not_modified(self):
+        r = self.client_app.get('/api/doc/swagger.json')
+        etag = r.headers['ETag']
+        assert etag.strip('"') == hashlib.sha256(r.data).hexdigest()
+
+        r = self.client_app.get('/api/doc/swagger.json', headers={'If-None-Match': etag})
+        assert r.status_code == 304
+        assert r.data == b''
+
+
+class TestExpectedValidation(BaseTest):
+    @classmethod
+    def setup_class(cls):
+        super().setup_class()
+
+        class ValidatedUsersResource(Resource):
+            @swagger.expected(UserModel, required=True, validate=True)
+            def post(self, _body):
+                return _body, 201
+
+            @swagger.expected([UserModel], validate=True)
+            def put(self):
+                return {'count': len(request.get_json(silent=True) or [])}
+
+        cls.api = Api(cls.app)
+        cls.api.add_resource(ValidatedUsersResource, '/validated_users')
+
+    def test_valid_body_is_passed_to_the_method(self):
+        r = self.client_app.post('/validated_users', json={'id': 1, 'name': 'somebody', 'password': 'secret'})
+        assert r.status_code == 201
+        assert json.loads(r.data.decode()) == {'id': 1, 'name': 'somebody', 'password': 'secret'}
+
+    def test_invalid_body_is_rejected(self):
+        r = self.client_app.post('/validated_users', json={'id': '1', 'other': 1})
+        assert r.status_code == 400
+        assert json.loads(r.data.decode())['errors'] == [
+            {'field': 'other', 'message': 'The model "UserModel" does not have an attribute "other"'},
+            {'field': 'id', 'message': 'The attribute "id" must be an int, but was "<class \'str\'>"'},
+            {'field': 'name', 'message': 'The attribute "name" is required'}
+        ]
+
+        r = self.client_app.post('/validated_users')
+        assert r.status_code == 400
+        assert json.loads(r.data.decode())['message'] == 'The request body is required'
+
+    def test_array_body(self):
+        r = self.client_app.put('/validated_users', json=[{'name': 'a'}, {'name': 'b'}])
+        assert r.status_code == 200
+        assert json.loads(r.data.decode()) == {'count': 2}
+
+        r = self.client_app.put('/validated_users', json=[{'name': 'a'}, {'id': 1}, 2])
+        assert r.status_code == 400
+        assert json.loads(r.data.decode())['errors'] == [{'index': 2, 'field': None, 'message': 'The item must be an object'}]
+
+        r = self.client_app.put('/validated_users')
+        assert r.status_code == 200
+
+    def test_unparsable_body_is_rejected(self):
+        for method in (self.client_app.post, self.client_app.put):
+            r = method('/validated_users', data='{bad json', content_type='application/json')
+            assert r.status_code == 400
+            assert json.loads(r.data.decode())['message'] == 'The request body is not valid json'
+
+            r = method('/validated_users', data='{"id": "x"}')
+            assert r.status_code == 400
+            assert json.loads(r.data.decode())['message'] == 'The request body must be sent as application/json'
+
+
+class TestSpecSnapshot(BaseTest):
+    @staticmethod
+    def write_snapshot(path, name):
+        api = Api(Blueprint(name, __name__))
+        api.add_resource(p_resource(), '/api/users')
+        api.add_resource(one_resource(), '/some_data')
+        spec = json.loads(swagger.export_swagger_doc(api.open_api_object, fingerprints=api.fingerprints)[0])
+        spec['paths']['/some_data']['get']['summary'] = 'From the snapshot'
+        with open(path, 'w') as f:
+            json.dump(spec, f)
+
+    def test_snapshot_is_served(self, tmpdir, caplog):
+        path = str(tmpdir.join('spec.json'))
+        self.write_snapshot(path, 'snapshot_export')
+
+        api = Api(self.app, spec_snapshot=path)
+        api.add_resource(p_resource(), '/api/users')
+        api.add_resource(one_resource(), '/some_data')
+
+        assert not caplog.records
+        assert 'x-fingerprints' not in api.open_api_object
+        r = self.client_app.get('/api/doc/swagger.json')
+        assert r.status_code == 200
+        data = json.loads(r.data.decode())
+        assert data['paths']['/some_data']['get']['summary'] == 'From the snapshot'
+        assert 'PModel' in data['components']['schemas']
+
+    def test_changed_resource_is_rebuilt(self, tmpdir, caplog):
+        path = str(tmpdir.join('spec.json'))
+        self.write_snapshot(path, 'snapshot_changed_export')
+
+        api = Api(Blueprint('snapshot_changed', __name__), spec_snapshot=path)
+        api.add_resource(p_resource(), '/api/users')
+        api.add_resource(one_resource(), '/other_data')
+
+        assert ['The documentation of "oneresource" does not match the snapshot, it is rebuilt'] == [
+            record.getMessage() for record in caplog.records
+        ]
+        paths = api.open_api_object['paths']
+        assert '/some_data' not in paths
+        assert paths['/other_data']['get']['tags'] == ['Some data']
+
+    def test_unregistered_resource_is_dropped(self, tmpdir):
+        path = str(tmpdir.join('spec.json'))
+        self.write_snapshot(path, 'snapshot_unregistered_export')
+
+        api = Api(Blueprint('snapshot_unregistered', __name__), spec_snapshot=path, lazy_spec=True)
+        api.add_resource(p_resource(), '/api/users')
+
+        assert list(api.open_api_object['paths']) == ['/api/users']
+
+        # registered after the first access, the resource is rebuilt
+        api.add_resource(one_resource(), '/some_data')
+        assert api.open_api_object['paths']['/some_data']['get']['summary'] == 'some summary'
+
+    def test_api_arguments_are_compared(self, tmpdir, caplog):
+        path = str(tmpdir.join('spec.json'))
+        self.write_snapshot(path, 'snapshot_arguments_export')
+
+        api = Api(Blueprint('snapshot_arguments', __name__), spec_snapshot=path, title='T2', version='2')
+        api.add_resource(p_resource(), '/api/users')
+        api.add_resource(one_resource(), '/some_data')
+
+        assert caplog.records[0].getMessage() == (
+            f'The arguments of the Api do not match the snapshot "{path}", the documentation is rebuilt'
+        )
+        assert api.open_api_object['info']['title'] == 'T2'
+        assert api.open_api_object['info']['version'] == '2'
+        assert api.open_api_object['paths']['/some_data']['get']['summary'] == 'some summary'
+
+    def test_fingerprint_is_the_same_in_every_process(self):
+        code = """if True:
+            from flask_restful.reqparse import RequestParser
+            from flask_restful_swagger_3 import Resource, swagger, _fingerprint
+
+            parser = RequestParser()
+            parser.add_argument('kind', type=str, location='args', choices={'a', 'b', 'c', 'd', 'e', 'f'})
+
+            class SetResource(Resource):
+                @swagger.response(200, description='Set')
+                @swagger.parameter({'name': 'color', 'in': 'query',
+                                    'schema': {'type': 'string', 'enum': {'red', 'green', 'blue', 'black'}}})
+                @swagger.reqparser(name='SetParser', parser=parser)
+                def get(self, _parser):
+                    return {}
+
+            print(_fingerprint(SetResource, ('/set',)))
+        """
+        fingerprints = set()
+        for seed in ('1', '2'):
+            output = subprocess.run([sys.executable, '-c', code], check=True, stdout=subprocess.PIPE,
+                                    env=dict(os.environ, PYTHONHASHSEED=seed), universal_newlines=True,
+                                    cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+            fingerprints.add(output)
+        assert len(fingerprints) == 1
+        assert fingerprints.pop().strip() != 'None'
+
+    def test_unfingerprintable_resource_is_rebuilt(self, tmpdir, caplog):
+        class Opaque:
+            __slots__ = ()
+
+        class OpaqueResource(Resource):
+            @swagger.response(200, description='Opaque')
+            @swagger.parameter({'name': 'o', 'in': 'query', 'schema': {'type': 'string', 'default': Opaque()}})
+            def get(self):
+                return {}
+
+        assert flask_restful_swagger_3._fingerprint(OpaqueResource, ('/opaque',)) is None
+
+        path = str(tmpdir.join('spec.json'))
+        self.write_snapshot(path, 'snapshot_opaque_export')
+        api = Api(Blueprint('snapshot_opaque', __name__), spec_snapshot=path, add_api_spec_resource=False)
+        api.add_resource(OpaqueResource, '/opaque')
+        assert [record.getMessage() for record in caplog.records] == [
+            'The documentation of "opaqueresource" holds values which can\'t be fingerprinted, it is rebuilt'
+        ]
+
+    def test_fingerprints_do_not_change_when_building(self):
+        api = Api(Blueprint('snapshot_fingerprints', __name__), lazy_spec=True)
+        api.add_resource(parse_resource(), '/parse/<int:parse_id>')
+        fingerprints = api.fingerprints
+
+        assert '/parse/{parse_id}' in api.open_api_object['paths']
+        assert api.fingerprints == fingerprints
+        assert fingerprints['resources']['parseresource']['operations'] == [['/parse/{parse_id}', 'get']]
+
+
+class TestRegistrationProfile(BaseTestSpecApi):
+    api_kwargs = {'profile_registration': True}
+
+    def test_report(self):
+        report = self.api.registration_profile.report()
+        assert [(record['resource'], record['urls']) for record in report] == [
+            ('SwaggerEndpoint', ['/api/doc/swagger.json', '/api/doc/swagger/<string:tag>.json',
+                                 '/api/doc/swagger.json/<path:pointer>']),
+            ('PResource', ['/api/users']),
+            ('OneResource', ['/some_data']),
+        ]
+        assert set(report[1]['phases']) == {'__build_model', '__build_parameters',
+                                            'validate_paths_object', 'validate_map_schema_object'}
+        assert 'validate_open_api_object' in report[0]['phases']
+        for record in report:
+            assert record['calls'] == 1
+            for figures in [record] + list(record['phases'].values()):
+                assert figures['time'] >= 0
+                assert figures['peak'] >= 0
+        assert report[1]['time'] >= report[1]['phases']['__build_model']['time']
+
+    def test_export(self, tmpdir):
+        path = str(tmpdir.join('report.json'))
+        self.api.registration_profile.export(path)
+        with open(path) as f:
+            assert json.load(f) == json.loads(json.dumps(self.api.registration_profile.report()))
+
+        path = str(tmpdir.join('report.csv'))
+        self.api.registration_profile.export(path, format='csv')
+        with open(path) as f:
+            rows = list(csv.DictReader(f))
+        assert rows[0]['phase'] == 'total'
+        assert ('PResource', '/api/users', '__build_parameters') in [
+            (row['resource'], row['urls'], row['phase']) for row in rows
+        ]
+
+        with pytest.raises(ValueError):
+            self.api.registration_profile.export(path, format='xml')
+
+    def test_environment_variable(self, monkeypatch):
+        assert Api(Blueprint('not_profiled', __name__)).registration_profile is None
+
+        monkeypatch.setenv('FLASK_RESTFUL_SWAGGER_3_PROFILE_REGISTRATION', '1')
+        api = Api(Blueprint('profiled', __name__), add_api_spec_resource=False)
+        api.add_resource(one_resource(), '/some_data')
+        assert [record['resource'] for record in api.registration_profile.report()] == ['OneResource']
+
+
+class TestSchemaCopies(BaseTest):
+    def test_documents_have_their_own_schemas(self):
+        apis = [Api(Blueprint(f'schema_copies_{i}', __name__)) for i in range(2)]
+        for api in apis:
+            api.add_resource(p_resource(), '/api/users')
+
+        schemas = apis[0].open_api_object['components']['schemas']
+        schemas['PModel']['properties']['name']['description'] = 'Edited'
+        examples = apis[0].open_api_object['paths']['/api/users']['get']['responses'][200]['content']
+        examples['application/json']['example'][0]['name'] = 'Edited'
+
+        assert 'description' not in apis[1].open_api_object['components']['schemas']['PModel']['properties']['name']
+        other = apis[1].open_api_object['paths']['/api/users']['get']['responses'][200]['content']['application/json']
+        assert other['example'][0]['name'] != 'Edited'
+
+
+class TestSpecShards(BaseTestSpecApi):
+    @classmethod
+    def setup_class(cls):
+        super().setup_class()
+        cls.api.open_api_object['components']['schemas']['Unused'] = {'type': 'string'}
+
+    def test_tag_shard(self):
+        r = self.client_app.get('/api/doc/swagger/User.json')
+        assert r.status_code == 200
+        spec = json.loads(r.data.decode())
+        assert list(spec['paths']) == ['/api/users']
+        assert list(spec['components']['schemas']) == ['PModel']
+        assert spec['info'] == self.api.open_api_object['info']
+
+        r = self.client_app.get('/api/doc/swagger/Unknown.json')
+        assert r.status_code == 404
+
+    def test_tags_parameter(self):
+        r = self.client_app.get('/api/doc/swagger.json?tags=Some data')
+        spec = json.loads(r.data.decode())
+        assert list(spec['paths']) == ['/some_data']
+        assert spec['components']['schemas'] == {}
+
+        r = self.client_app.get('/api/doc/swagger.json?tags=User,Some data')
+        spec = json.loads(r.data.decode())
+        assert list(spec['paths']) == ['/api/users', '/some_data']
+        assert list(spec['components']['schemas']) == ['PModel']
+
+        r = self.client_app.get('/api/doc/swagger.json')
+        assert 'Unused' in json.loads(r.data.decode())['components']['schemas']
+
+    def test_shards_have_their_own_etag(self):
+        etags = {self.client_app.get(url).headers['ETag'] for url in (
+            '/api/doc/swagger.json', '/api/doc/swagger/User.json', '/api/doc/swagger/Some data.json'
+        )}
+        assert len(etags) == 3
+
+        r = self.client_app.get('/api/doc/swagger/User.json')
+        r = self.client_app.get('/api/doc/swagger/User.json', headers={'If-None-Match': r.headers['ETag']})
+        assert r.status_code == 304
+
+
+class TestSpecPointer(BaseTestSpecApi):
+    def test_pointer_route(self):
+        r = self.client_app.get('/api/doc/swagger.json/paths/~1some_data/get')
+        assert r.status_code == 200
+        operation = json.loads(r.data.decode())
+        assert operation['tags'] == ['Some data']
+        assert operation['responses']['200']['description'] == 'Some data'
+        assert r.headers['ETag'].strip('"') == hashlib.sha256(r.data).hexdigest()
+
+        r = self.client_app.get('/api/doc/swagger.json/paths/~1some_data/get',
+                                headers={'If-None-Match': r.headers['ETag']})
+        assert r.status_code == 304
+
+    def test_pointer_parameter(self):
+        r = self.client_app.get('/api/doc/swagger.json?pointer=/components/schemas/PModel')
+        assert r.status_code == 200
+        assert json.loads(r.data.decode()) == self.api.open_api_object['components']['schemas']['PModel']
+
+        r = self.client_app.get('/api/doc/swagger/User.json?pointer=/paths')
+        assert list(json.loads(r.data.decode())) == ['/api/users']
+
+    def test_unknown_pointer(self):
+        assert self.client_app.get('/api/doc/swagger.json/paths/~1unknown').status_code == 404
+        assert self.client_app.get('/api/doc/swagger.json?pointer=/info/title/0').status_code == 404
+        assert self.client_app.get('/api/doc/swagger.json?pointer=info').status_code == 400
+
+    def test_pointer_route_without_extension(self):
+        app = Flask(__name__)
+        api = Api(app, swagger_url='spec')
+        api.add_resource(one_resource(), '/some_data')
+
+        with app.test_client() as client:
+            r = client.get('/api/doc/spec/info')
+            assert r.status_code == 200
+            assert json.loads(r.data.decode())['title'] == 'Example'
+            r = client.get('/api/doc/spec?tags=Some data')
+            assert list(json.loads(r.data.decode())['paths']) == ['/some_data']
+
+
+class TestLazySpec(BaseTestSpecApi):
+    api_kwargs = {'lazy_spec': True}
+
+    def test_resource_is_served_before_spec_is_built(self):
+        r = self.client_app.post('/api/users?id=0&name=string&mail=john.doe@butcher.com&keys=john&keys=max')
+        assert r.status_code == 201
+        assert json.loads(r.data.decode()) == {
+            'id': 0, 'name': 'string', 'mail': 'john.doe@butcher.com', 'keys': ['john', 'max']
+        }
+
+    def test_spec_is_built_on_first_access(self):
+        r = self.client_app.get('/api/doc/swagger.json')
+        assert r.status_code == 200
+
+        data = json.loads(r.data.decode())
+        assert list(data['paths']) == ['/api/users', '/some_data']
+        assert 'PModel' in data['components']['schemas']
+        assert self.api.open_api_object['paths']['/some_data']['get']['tags'] == ['Some data']
+
+    def test_errors_are_raised_on_first_access(self, bad_format_url):
+        api = Api(Blueprint('lazy_bad_url', __name__), add_api_spec_resource=False, lazy_spec=True)
+        api.add_resource(bad_format_url, '/bad_url/')
+
+        with pytest.raises(swagger.ValidationError):
+            api.open_api_object
+        # the invalid document is never served
+        with pytest.raises(swagger.ValidationError):
+            api.open_api_object
+        with pytest.raises(swagger.ValidationError):
+            api.spec_generation
+
+    def test_invalid_document_is_not_served(self):
+        class BadResponseCode(Resource):
+            @swagger.response(999, description='Not an http status')
+            def get(self):
+                return {}
+
+        app = Flask(__name__)
+        api = Api(app, lazy_spec=True)
+        api.add_resource(BadResponseCode, '/bad_response_code')
+
+        client = app.test_client()
+        for _ in range(2):
+            assert client.get('/api/doc/swagger.json').status_code == 500
+        assert client.get('/bad_response_code').status_code == 200
+
+
 class TestNoAuthorizeApi(NotAuthorizeApi):
 
     def test_get_spec_object(self):
@@ -0,0 +1,53 @@
+import hashlib
+import json
+import pytest
+
+from flask import Flask
+
+from flask_restful_swagger_3 import Api, swagger
+from flask_restful_swagger_3.__main__ import main
+from tests.fixtures.fixture_resources import p_resource, one_resource
+
+
+def create_api():
+    api = Api(Flask(__name__))
+    api.add_resource(p_resource(), '/api/users')
+    api.add_resource(one_resource(), '/some_data')
+    return api
+
+
+def create_invalid_api():
+    api = create_api()
+    api.open_api_object['info']['artist'] = 'Picasso'
+    return api
+
+
+class TestMain:
+    def test_export(self, tmpdir):
+        out = str(tmpdir.join('spec.json'))
+        assert main(['export', 'tests.test_main:create_api', '--out', out]) == 0
+
+        with open(out, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        with open(out + '.sha256') as f:
+            assert f.read() == digest + '  spec.json\n'
+
+        api = create_api()
+        spec = json.loads(data)
+        assert spec.pop('x-fingerprints') == api.fingerprints
+        assert spec == json.loads(json.dumps(swagger.get_swagger_doc(api.open_api_object)))
+        assert data == swagger.export_swagger_doc(api.open_api_object, fingerprints=api.fingerprints)[0]
+        assert list(json.loads(data)) == sorted(json.loads(data))
+
+    def test_export_invalid_document(self, tmpdir, capsys):
+        out = str(tmpdir.join('spec.json'))
+        assert main(['export', 'tests.test_main:create_invalid_api', '--out', out]) == 1
+        assert not tmpdir.join('spec.json').exists()
+        assert '/info/artist: Invalid info object. Unknown field "artist"' in capsys.readouterr().err
+
+    def test_command_is_required(self, capsys):
+        with pytest.raises(SystemExit) as e:
+            main([])
+        assert e.value.code == 2
+        assert 'a command is required' in capsys.readouterr().err
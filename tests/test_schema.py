@@ -3,7 +3,8 @@ import json
 import pytest
 from flask_restful_swagger_3.exceptions import SchemaAlreadyExist
 
-from flask_restful_swagger_3 import Schema, ExampleEncoder, swagger
+import flask_restful_swagger_3
+from flask_restful_swagger_3 import Schema, DefinitionEncoder, ExampleEncoder, swagger
 
 
 class TestSchema:
@@ -90,12 +91,48 @@ class TestSchema:
         with pytest.raises(ValueError):
             bad_enum_schema_type(**enum_obj)
 
+    def test_should_raise_enum_error_only_when_attribute_is_given(self):
+        class LateBadEnumSchema(Schema):
+            type = 'object'
+            properties = {
+                'my_choice': {
+                    'type': 'string',
+                    'enum': 'choice1'
+                }
+            }
+
+        assert LateBadEnumSchema(**{}) == {}
+        for _ in range(2):
+            with pytest.raises(TypeError):
+                LateBadEnumSchema(**{'my_choice': 'choice1'})
+
+    def test_should_validate_array_with_items_of_dict(self):
+        class ArrayOfDictItems(Schema):
+            type = 'object'
+            properties = {
+                'keys': {'type': 'array', 'items': {'type': 'string'}}
+            }
+
+        assert ArrayOfDictItems(keys=['a', 'b']) == {'keys': ['a', 'b']}
+        with pytest.raises(ValueError):
+            ArrayOfDictItems(keys=['a', 1])
+
     def test_should_validate_obj_with_sub_schema(self, sub_schema, obj_of_sub_schema):
         assert sub_schema(**obj_of_sub_schema)
 
     def test_sub_schema_has_required_of_parent(self, sub_schema_without_required):
         assert sub_schema_without_required.required == ['other_attribute']
 
+    def test_get_super_classes_in_registration_order(self, super_schema, sub_schema):
+        class SubSubSchema(sub_schema):
+            properties = {
+                'sub_sub_attribute': {'type': 'string'}
+            }
+
+        assert SubSubSchema.get_super_classes() == [super_schema, sub_schema]
+        assert list(SubSubSchema.properties) == ['id', 'super_attribute', 'other_attribute',
+                                                 'sub_attribute', 'sub_sub_attribute']
+
     def test_should_valdate_definitions_of_sub_schema(self, sub_schema, expected_definition_of_sub_schema):
         assert sub_schema.definitions()['properties'] == expected_definition_of_sub_schema['properties']
         for required in sub_schema.definitions()['required']:
@@ -104,6 +141,15 @@ class TestSchema:
     def test_should_valdate_example_of_sub_schema(self, sub_schema, expected_example_of_sub_schema):
         assert sub_schema.example() == expected_example_of_sub_schema
 
+    def test_json_definitions_and_example_are_computed_once(self, nested_schema):
+        definitions = flask_restful_swagger_3._json_definitions(nested_schema)
+        example = flask_restful_swagger_3._json_example(nested_schema)
+
+        assert definitions == json.loads(json.dumps(nested_schema.definitions(), cls=DefinitionEncoder))
+        assert example == json.loads(json.dumps(nested_schema.example(), cls=ExampleEncoder))
+        assert flask_restful_swagger_3._json_definitions(nested_schema) is definitions
+        assert flask_restful_swagger_3._json_example(nested_schema) is example
+
     def test_should_valdate_example_of_sub_schema_empty(self, sub_schema_empty, expected_example_of_sub_schema):
         del expected_example_of_sub_schema['sub_attribute']
         assert sub_schema_empty.example() == expected_example_of_sub_schema
@@ -304,6 +350,105 @@ class TestSchema:
         }
         assert user_model(**user) == user_result
 
+    def test_validate_many(self, user_model, p_model):
+        users = [
+            {'id': 1, 'name': 'test', 'password': 'password'},
+            {'id': 2, 'name': 'other', 'password': None}
+        ]
+        assert user_model.validate_many(users) == ([{'id': 1, 'name': 'test'}, {'id': 2, 'name': 'other'}], [])
+
+        p_models = [
+            {'id': 1, 'name': 'test', 'mail': 'test@example.com', 'keys': ['key']},
+            {'id': 2, 'name': 'test', 'keys': []}
+        ]
+        assert p_model.validate_many(p_models) == (p_models, [])
+
+    def test_validate_many_errors(self, schema_test_model, p_model):
+        rows = [
+            {'id': 1, 'name': 'test'},
+            {'id': '2', 'name': 'test', 'unknown': 1},
+            {'name': 1},
+        ]
+        assert schema_test_model.validate_many(rows) == (None, [
+            {'row': 1, 'field': 'unknown', 'message': 'The model "SchemaTestModel" does not have an attribute "unknown"'},
+            {'row': 1, 'field': 'id', 'message': 'The attribute "id" must be an int, but was "<class \'str\'>"'},
+            {'row': 2, 'field': 'name', 'message': 'The attribute "name" must be a string, but was "<class \'int\'>"'},
+            {'row': 2, 'field': 'id', 'message': 'The attribute "id" is required'}
+        ])
+
+        records, errors = p_model.validate_many([
+            {'id': 2 ** 64, 'name': 'test', 'keys': []},
+            {'name': 'test', 'mail': 'test', 'keys': ['key', 1]}
+        ])
+        assert records is None
+        assert [(error['row'], error['field']) for error in errors] == [(0, 'id'), (1, 'mail'), (1, 'keys')]
+
+    def test_schema_record_mode(self, user_model):
+        class UserRecordModel(user_model, record=True):
+            pass
+
+        user = UserRecordModel(id=1, name='test', password='password')
+        assert isinstance(user, flask_restful_swagger_3.SchemaRecord)
+        assert not hasattr(user, '__dict__')
+        assert user == {'id': 1, 'name': 'test'}
+        assert user['name'] == 'test' and len(user) == 2
+        assert json.dumps([user], cls=flask_restful_swagger_3.RecordEncoder) == '[{"id": 1, "name": "test"}]'
+        assert dict(UserRecordModel(name='test')) == {'name': 'test'}
+
+        with pytest.raises(KeyError):
+            UserRecordModel(name='test')['id']
+        with pytest.raises(ValueError):
+            UserRecordModel(id='1', name='test')
+        with pytest.raises(ValueError):
+            UserRecordModel(id=1)
+
+    def test_schema_overriding_check_type(self):
+        class PositiveModel(Schema):
+            properties = {
+                'count': {'type': 'integer'},
+                'tags': {'type': 'array', 'items': {'type': 'string'}},
+                'email': {'type': 'string', 'format': 'email', 'load_only': True},
+            }
+
+            def check_type(self, type_, key, value):
+                super().check_type(type_, key, value)
+                if type_ == 'integer' and value < 0:
+                    raise ValueError(f'The attribute "{key}" must be positive')
+
+        assert PositiveModel(count=1, tags=['a'], email='john@doe.com') == {'count': 1, 'tags': ['a']}
+        assert PositiveModel(count=1).prop == {'type': 'integer'}
+        with pytest.raises(ValueError, match='must be positive'):
+            PositiveModel(count=-1)
+        with pytest.raises(ValueError):
+            PositiveModel(tags=[1])
+        with pytest.raises(ValueError):
+            PositiveModel(email='john')
+        assert PositiveModel.validate_many([{'count': 1}, {'count': -1}])[1] == [
+            {'row': 1, 'field': 'count', 'message': 'The attribute "count" must be positive'}
+        ]
+
+        with pytest.raises(TypeError):
+            class PositiveRecordModel(PositiveModel, record=True):
+                pass
+
+    def test_schema_check_methods(self):
+        class CheckedModel(Schema):
+            properties = {'count': {'type': 'integer', 'nullable': True}}
+
+        model = CheckedModel(count=1)
+        model.check_type('integer', 'count', 2)
+        with pytest.raises(ValueError):
+            model.check_type('integer', 'count', 'a')
+        with pytest.raises(ValueError):
+            Schema.check_format('string', 'email', 'john')
+        model.prop = CheckedModel.properties['count']
+        assert model.get_boolean_attribute('nullable')
+
+    def test_schema_record_mode_without_properties(self):
+        with pytest.raises(TypeError):
+            class StringRecordModel(Schema, record=True):
+                type = 'string'
+
     def test_schema_valid_when_load_only_and_true(self):
         class SchemaLoadOnlyAndTrue(Schema):
             type = 'object'
@@ -1,7 +1,14 @@
+import os
+import sys
+import json
+import hashlib
+import subprocess
 import pytest
+from http import HTTPStatus
 from flask_restful import inputs
 
 import flask_restful_swagger_3.swagger as swagger
+from flask_restful_swagger_3 import constants
 from flask_restful_swagger_3 import Schema
 
 
@@ -253,6 +260,36 @@ class TestSwagger:
 
         assert swagger.get_parser(params)
 
+    def test_parameters_should_build_parser_once(self):
+        @swagger.parameters([{'name': 'name', 'in': 'query', 'schema': {'type': 'string'}}])
+        def get(self, _parser):
+            return _parser
+
+        @swagger.parameters([{'name': 'page', 'in': 'query', 'schema': {'type': 'integer'}}])
+        def get_without_parser(self):
+            return None
+
+        parser = get(None)
+        assert parser is get(None)
+        assert [arg.name for arg in parser.args] == ['name']
+        assert get_without_parser(None) is None
+
+    def test_stream_swagger_doc(self, monkeypatch):
+        monkeypatch.setattr(swagger, 'STREAM_CHUNK_SIZE', 16)
+        doc = {
+            'paths': {'/b': {'get': {'description': 'b'}}, '/a': {'post': {}}},
+            'openapi': '3.0.2',
+            'components': {'schemas': {'A': {'type': 'string'}}, 'securitySchemes': {}},
+            'info': {'title': 'title', 'version': '1'}
+        }
+
+        chunks = list(swagger.stream_swagger_doc(doc))
+        assert len(chunks) > 1
+        data = b''.join(chunks).decode()
+        assert json.loads(data) == doc
+        assert list(json.loads(data)) == ['openapi', 'info', 'paths', 'components']
+        assert swagger.digest_swagger_doc(doc) == (None, hashlib.sha256(data.encode()).hexdigest())
+
     def test_should_get_data_action_is_none(self):
         assert swagger.get_data_action({}) is None
 
@@ -872,6 +909,16 @@ class TestSwagger:
         with pytest.raises(swagger.ValidationError):
             assert swagger.validate_security_requirement_object(security[0], None)
 
+    def test_validate_security_requirement_object_fail_when_security_schemes_not_dict(self, security):
+        with pytest.raises(swagger.ValidationError):
+            swagger.validate_security_requirement_object(security[0], 5)
+
+        document = {'openapi': '3.0.2', 'info': {'title': 'T', 'version': '1'}, 'paths': {},
+                    'components': {'securitySchemes': 5}, 'security': security}
+        with pytest.raises(swagger.ValidationError) as e:
+            swagger.validate_open_api_object(document)
+        assert {error['path'] for error in e.value.errors} >= {'/components/securitySchemes', '/security/0'}
+
     def test_validate_security_requirement_object_fail_when_security_item_list_not_empty(
             self, security, components_security_schemes_object):
         security[0]['api-key'].append("something")
@@ -917,3 +964,187 @@ class TestSwagger:
 
     def test_not_validate_media_type_bad_format(self, media_types):
         assert not swagger.validate_media_type(media_types[-1])
+
+    def test_validation_error_collects_all_errors(self):
+        paths_object = {
+            '/users/{user_id}': {
+                'get': {
+                    'summary': 1,
+                    'parameters': [{'name': 'user_id', 'in': 'body'}],
+                    'responses': {200: {}}
+                }
+            },
+            'users': {}
+        }
+        with pytest.raises(swagger.ValidationError) as e:
+            swagger.validate_paths_object(paths_object, {})
+
+        assert [error['path'] for error in e.value.errors] == [
+            '/~1users~1{user_id}/get/summary',
+            '/~1users~1{user_id}/get/parameters/0/in',
+            '/~1users~1{user_id}/get/responses/200',
+            '/users'
+        ]
+        assert str(e.value) == e.value.errors[0]['message']
+
+    def test_import_is_lazy(self):
+        modules = ['flask_restful.inputs', 'flask_restful.reqparse', 'flask_restful_swagger_3.validator',
+                   'flask_restful_swagger_3.swagger_format', 'flask_restful_swagger_3.profiling', 'tracemalloc',
+                   'gzip', 'csv']
+        code = 'import sys, flask_restful_swagger_3; print([m for m in {} if m in sys.modules])'.format(modules)
+        output = subprocess.run([sys.executable, '-c', code], check=True, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, universal_newlines=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+        assert output == '[]\n'
+
+    def test_responses_object_list(self):
+        assert set(constants.http_status_value) | set(constants.unassigned_code) <= set(constants.responses_object_list)
+        assert constants.http_status_enum[0] is HTTPStatus.CONTINUE
+
+    def test_get_shard(self):
+        swagger_object = {
+            'paths': {
+                '/a': {'get': {'tags': ['T'], 'responses': {200: {'content': {'application/json': {
+                    'schema': {'$ref': '#/components/schemas/A'}}}}}}},
+                '/d': {'get': {'tags': ['U'], 'parameters': [{'$ref': '#/components/parameters/E'}]},
+                       'post': {'tags': ['T', 'U']}},
+            },
+            'components': {
+                'schemas': {
+                    'A': {'type': 'object', 'properties': {'b': {'type': 'array', 'items': {
+                        '$ref': '#/components/schemas/B'}}}},
+                    'B': {'allOf': [{'$ref': '#/components/schemas/C'}]},
+                    'C': {'type': 'string'},
+                    'D': {'type': 'string'},
+                    'E': {'type': 'string'},
+                },
+                'parameters': {'E': {'name': 'e', 'in': 'query', 'schema': {'$ref': '#/components/schemas/E'}}},
+            },
+        }
+        index = swagger.get_spec_index(swagger_object)
+        assert index['tags'] == {'T': {('/a', 'get'), ('/d', 'post')}, 'U': {('/d', 'get'), ('/d', 'post')}}
+
+        assert swagger.get_shard(index, ['T']) == ({('/a', 'get'), ('/d', 'post')}, {'A', 'B', 'C', 'E'})
+        assert swagger.get_shard(index, ['U']) == ({('/d', 'get'), ('/d', 'post')}, {'E'})
+        assert swagger.get_shard(index, ['T'], frozenset([('/d', 'post')])) == ({('/d', 'post')}, {'E'})
+
+        operations, schemas = swagger.get_shard(index, ['U'])
+        doc = swagger.get_swagger_doc(swagger_object, operations=operations, schemas=schemas)
+        assert list(doc['paths']) == ['/d']
+        assert doc['components']['schemas'] == {'E': {'type': 'string'}}
+        assert doc['components']['parameters'] == swagger_object['components']['parameters']
+
+    def test_resolve_json_pointer(self):
+        document = {'paths': {'/users/{id}': {'get': {'tags': ['User']}}}, 'a~b': [1, {'c': None}], '': 0}
+        assert swagger.resolve_json_pointer(document, '') is document
+        assert swagger.resolve_json_pointer(document, '/paths/~1users~1{id}/get/tags/0') == 'User'
+        assert swagger.resolve_json_pointer(document, '/a~0b/1/c') is None
+        assert swagger.resolve_json_pointer(document, '/') == 0
+
+        for pointer in ('/paths/users', '/a~0b/2', '/a~0b/01', '/a~0b/-', '/a~0b/0/c'):
+            with pytest.raises(KeyError):
+                swagger.resolve_json_pointer(document, pointer)
+        with pytest.raises(ValueError):
+            swagger.resolve_json_pointer(document, 'paths')
+
+    def test_resolve_swagger_pointer(self):
+        swagger_object = {
+            'info': {'title': 'T', 'version': '1'},
+            'externalDocs': {},
+            'paths': {
+                '/a': {'get': {'responses': {200: {'description': 'A'}}}, 'post': {}},
+                '/b': {'get': {}},
+            },
+            'components': {'schemas': {'A': {'type': 'string'}, 'B': {'type': 'integer'}}},
+        }
+        operations = frozenset([('/a', 'get')])
+        schemas = frozenset(['A'])
+
+        def resolve(pointer):
+            return swagger.resolve_swagger_pointer(swagger_object, pointer, operations, schemas)
+
+        assert resolve('/paths/~1a/get/responses/200') is swagger_object['paths']['/a']['get']['responses'][200]
+        assert list(resolve('/paths')) == ['/a']
+        assert list(resolve('/paths/~1a')) == ['get']
+        assert resolve('/components/schemas') == {'A': {'type': 'string'}}
+        assert resolve('/components/schemas/A/type') == 'string'
+        assert resolve('') == swagger.get_swagger_doc(swagger_object, operations=operations, schemas=schemas)
+        for pointer in ('/externalDocs', '/paths/~1b', '/paths/~1a/post', '/components/schemas/B', '/servers'):
+            with pytest.raises(KeyError):
+                resolve(pointer)
+        assert swagger.resolve_swagger_pointer(swagger_object, '/components/schemas/B') == {'type': 'integer'}
+
+    def test_validate_operation_object_fast_path(self):
+        operation_object = {
+            'tags': ['users'],
+            'parameters': [{'name': 'id', 'in': 'query', 'schema': {'type': 'integer'}}],
+            'requestBody': {'content': {'application/json': {'schema': {'$ref': '#/components/schemas/User'}}}},
+            'responses': {200: {'description': 'OK', 'content': {'application/json': {'schema': {'type': 'object'}}}}}
+        }
+        assert swagger.validate_operation_object(operation_object, {}) is None
+
+        operation_object['parameters'][0]['schema']['items'] = {'type': 'integer'}
+        with pytest.raises(swagger.ValidationError) as e:
+            swagger.validate_operation_object(operation_object, {})
+        assert e.value.errors[0]['path'] == '/parameters/0/schema/items'
+
+    def test_get_serializer(self):
+        class SerializedTagModel(Schema):
+            type = 'object'
+            properties = {
+                'name': {'type': 'string'},
+                'secret': {'type': 'string', 'load_only': True}
+            }
+
+        class SerializedUserModel(Schema):
+            type = 'object'
+            properties = {
+                'id': {'type': 'integer'},
+                'password': {'type': 'string', 'load_only': 'true'},
+                'tag': SerializedTagModel,
+                'tags': SerializedTagModel.array(),
+                'names': {'type': 'array', 'items': {'type': 'string'}}
+            }
+
+        serialize = swagger.get_serializer(SerializedUserModel)
+        assert swagger.get_serializer(SerializedUserModel) is serialize
+
+        user = {
+            'tags': [{'name': 'a', 'secret': 's'}, {'name': 'b'}],
+            'unknown': 1,
+            'password': 'secret',
+            'id': 1,
+            'tag': {'name': 'c', 'secret': 's'},
+            'names': ['d']
+        }
+        result = serialize(user)
+        assert result == {'id': 1, 'tag': {'name': 'c'}, 'tags': [{'name': 'a'}, {'name': 'b'}], 'names': ['d']}
+        assert list(result) == ['id', 'tag', 'tags', 'names']
+        assert serialize({'id': 1, 'tag': None}) == {'id': 1, 'tag': None}
+
+        @swagger.reorder_list_with(SerializedTagModel, serialize=True)
+        def get(self, code=200):
+            return [{'name': 'a', 'secret': 's'}], code
+
+        assert get(None) == ([{'name': 'a'}], 200)
+        assert get(None, 404) == ([{'name': 'a', 'secret': 's'}], 404)
+
+    def test_stacked_serializers(self):
+        class StackedErrorModel(Schema):
+            type = 'object'
+            properties = {'message': {'type': 'string'}}
+
+        class StackedItemModel(Schema):
+            type = 'object'
+            properties = {'name': {'type': 'string'}}
+
+        @swagger.reorder_with(StackedErrorModel, response_code=404, serialize=True)
+        @swagger.reorder_with(StackedItemModel, serialize=True)
+        def get(self, found=True, as_tuple=False):
+            if not found:
+                return {'message': 'Not found', 'name': 'n'}, 404
+            return ({'name': 'a', 'other': 1},) if as_tuple else {'name': 'a', 'other': 1}
+
+        assert get(None) == {'name': 'a'}
+        assert get(None, as_tuple=True) == ({'name': 'a'},)
+        assert get(None, found=False) == ({'message': 'Not found'}, 404)